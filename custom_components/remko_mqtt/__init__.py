@@ -1,8 +1,13 @@
+import asyncio
 import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, Event
+from homeassistant.core import HomeAssistant, Event, callback
+from homeassistant.components import mqtt
 from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
 
 from .const import (
@@ -10,11 +15,20 @@ from .const import (
     CONF_ID,
 )
 
-from .heatpump import HeatPump
+from .heatpump import HeatPump, async_remove_state_cache
+from .scheduler import DeadlineScheduler, QueryGate
 
 _LOGGER = logging.getLogger(__name__)
 
 
+# Shared subscription of all heat pumps in fleet mode
+_FLEET_TOPIC = "+/SMTID/+"
+
+# Re-queries after an MQTT reconnect are spread over this many seconds per
+# heat pump, up to a maximum
+_REQUERY_SPREAD = 0.5
+_REQUERY_MAX_SPREAD = 30
+
 PLATFORMS = [
     "binary_sensor",
     "sensor",
@@ -47,6 +61,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # add new heatpump to worker
     heatpump = await worker.add_entry(entry)
 
+    # Restore the last known state before the entities are created
+    await heatpump.async_load_state()
+
     # Register update listener and ensure it is cleaned up on unload
     unload_update_listener = entry.add_update_listener(reload_entry)
     entry.async_on_unload(unload_update_listener)
@@ -54,19 +71,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     async def handle_hass_started(_event: Event) -> None:
         await hass.async_create_task(heatpump.setup_mqtt())
 
-    await hass.async_create_task(heatpump.check_capabilities())
-
-    # Load the platforms for heatpump
-    hass.async_create_task(
-        hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    )
+    async def forward_platforms() -> None:
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        heatpump.async_platforms_ready()
 
     if hass.is_running:
-        # Immediately start MQTT setup if HA already running
-        await hass.async_create_task(heatpump.setup_mqtt())
+        # Subscribe and query while the platforms are loaded, the entities
+        # are refreshed once the first data arrives
+        await asyncio.gather(forward_platforms(), heatpump.setup_mqtt())
     else:
         # Wait for hass to start and then setup mqtt
         hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, handle_hass_started)
+        await forward_platforms()
 
     async def handle_update_timeprogram(service_call):
         try:
@@ -114,17 +130,29 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         worker: RemkoWorker = hass.data[DOMAIN]
-        await hass.async_create_task(
-            worker.update_heatpump_entry(entry)
-        ) if False else None
+        (
+            await hass.async_create_task(worker.update_heatpump_entry(entry))
+            if False
+            else None
+        )
+        heatpump = worker.heatpumps.get(entry.data[CONF_ID])
+        if heatpump is not None:
+            # Stop subscriptions and pending keep-alives
+            await heatpump.remove_mqtt()
         worker.remove_entry(entry)
         if worker.is_idle():
             # also remove worker if not used by any entry any more
+            worker.async_stop()
             hass.data.pop(DOMAIN, None)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the state cache of a deleted config entry."""
+    await async_remove_state_cache(hass, entry.data[CONF_ID])
+
+
 async def reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry when options change."""
     if DOMAIN in hass.data:
@@ -141,6 +169,22 @@ class RemkoWorker:
         self._heatpumps: dict[str, Any] = {}
         self._worker = True
 
+        # Keep-alive deadlines and queries in flight of all heat pumps
+        self.scheduler = DeadlineScheduler(hass)
+        self.query_gate = QueryGate(self.scheduler)
+        self._unsub_connection: Callable[[], None] | None = None
+
+        # Fleet mode: MQTT node -> message handler of its heat pump
+        self._routes: dict[str, Callable[[Any], Awaitable[None]]] = {}
+        self._route_lock = asyncio.Lock()
+        self._unsub_fleet: Callable[[], None] | None = None
+        self._stats = {
+            "messages_routed": 0,
+            "messages_unrouted": 0,
+            "dispatch_avg_us": 0.0,
+            "handler_avg_us": 0.0,
+        }
+
     @property
     def worker(self) -> bool:
         return self._worker
@@ -151,9 +195,15 @@ class RemkoWorker:
 
     async def add_entry(self, config_entry: ConfigEntry) -> HeatPump:
         """Add entry and create HeatPump instance."""
+        if self._unsub_connection is None:
+            self._unsub_connection = mqtt.async_subscribe_connection_status(
+                self._hass, self._async_connection_changed
+            )
         heatpump = HeatPump(self._hass, config_entry)
         await heatpump.update_config(config_entry)
         self._heatpumps[config_entry.data[CONF_ID]] = heatpump
+        # Heat pumps set up together query at startup
+        self.query_gate.track_burst("setup", [config_entry.data[CONF_ID]])
         self._hass.bus.fire(
             f"{DOMAIN}_changed",
             {"action": "add", "heatpump": config_entry.data[CONF_ID]},
@@ -170,12 +220,90 @@ class RemkoWorker:
         self._heatpumps.pop(config_entry.data[CONF_ID], None)
 
     async def update_heatpump_entry(self, config_entry: ConfigEntry) -> None:
-        """Update heatpump configuration and restart MQTT setup."""
+        """Update heatpump configuration and restart MQTT setup if needed."""
         hp = self._heatpumps.get(config_entry.data[CONF_ID])
         if not hp:
             return
-        await hp.update_config(config_entry)
-        await self._hass.async_create_task(hp.setup_mqtt())
+        if await hp.update_config(config_entry):
+            await self._hass.async_create_task(hp.setup_mqtt())
 
     def is_idle(self) -> bool:
         return not bool(self._heatpumps)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop watching the MQTT connection and cancel pending deadlines."""
+        if self._unsub_connection is not None:
+            self._unsub_connection()
+            self._unsub_connection = None
+        # Re-queries after a reconnect may still be waiting
+        self.scheduler.async_stop()
+
+    @callback
+    def _async_connection_changed(self, connected: bool) -> None:
+        """Query all heat pumps again after an MQTT reconnect.
+
+        Reports were lost while disconnected.  The queries are spread
+        randomly so the units do not all answer at once.
+        """
+        if not connected:
+            return
+        spread = min(_REQUERY_SPREAD * len(self._heatpumps), _REQUERY_MAX_SPREAD)
+        _LOGGER.debug("MQTT reconnected, querying heat pumps within %s s", spread)
+        self.query_gate.track_burst("reconnect", self._heatpumps)
+        for heatpump in self._heatpumps.values():
+            self.scheduler.call_later(random.uniform(0, spread), heatpump.async_requery)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return fleet routing counters."""
+        stats = dict(self._stats, routes=len(self._routes))
+        stats["dispatch_avg_us"] = round(stats["dispatch_avg_us"], 2)
+        stats["handler_avg_us"] = round(stats["handler_avg_us"], 1)
+        return stats
+
+    async def async_add_route(
+        self, node: str, handler: Callable[[Any], Awaitable[None]]
+    ) -> Callable[[], None]:
+        """Route messages of an MQTT node through the shared subscription.
+
+        Subscribes on the first route.  Returns a function removing the route.
+        """
+        async with self._route_lock:
+            self._routes[node] = handler
+            if self._unsub_fleet is None:
+                self._unsub_fleet = await mqtt.async_subscribe(
+                    self._hass, _FLEET_TOPIC, self._async_dispatch
+                )
+
+        @callback
+        def remove_route() -> None:
+            if self._routes.get(node) is handler:
+                del self._routes[node]
+            if not self._routes and self._unsub_fleet is not None:
+                self._unsub_fleet()
+                self._unsub_fleet = None
+
+        return remove_route
+
+    async def _async_dispatch(self, message) -> None:
+        """Pass a message of the shared subscription to its heat pump."""
+        start = time.perf_counter()
+        handler = self._routes.get(message.topic.partition("/")[0])
+        routed = time.perf_counter()
+        stats = self._stats
+        # Running means of the route lookup per message and of the handler
+        # per routed message
+        dispatched = stats["messages_routed"] + stats["messages_unrouted"] + 1
+        stats["dispatch_avg_us"] += (
+            (routed - start) * 1e6 - stats["dispatch_avg_us"]
+        ) / dispatched
+        if handler is None:
+            # Another device on the broker
+            stats["messages_unrouted"] += 1
+            return
+        await handler(message)
+        stats["messages_routed"] += 1
+        stats["handler_avg_us"] += (
+            (time.perf_counter() - routed) * 1e6 - stats["handler_avg_us"]
+        ) / stats["messages_routed"]
@@ -13,18 +13,11 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity_registry import RegistryEntryDisabler
 
 from .const import DOMAIN, CONF_ID, CONF_NAME, CONF_VER
-from .remko_regs import (
-    FIELD_REGID,
-    FIELD_REGTYPE,
-    FIELD_ACTIVE,
-    remko_reg_translation,
-    remko_reg,
-)
+from .registry import BY_PLATFORM
 
 _LOGGER = logging.getLogger(__name__)
 
 # Constants
-_BUTTON_TYPES = {"action"}
 _ICON_MAPPING = {
     "dhw_heating": "mdi:heat-wave",
 }
@@ -45,37 +38,23 @@ async def async_setup_entry(
     heatpump = hass.data[DOMAIN]._heatpumps[config_entry.data[CONF_ID]]
     entities: list[ButtonEntity] = []
 
-    for reg_name, reg_data in remko_reg.items():
-        reg_type = reg_data[FIELD_REGTYPE]
-        reg_id = reg_data[FIELD_REGID]
-        active = (
-            reg_data[FIELD_ACTIVE] != False
-        )  # Default to True if FIELD_ACTIVE not present
-
-        # Only create buttons for action type
-        if reg_type not in _BUTTON_TYPES:
-            continue
-
-        # Get friendly name from translation
-        friendly_name = None
-        if reg_name in remko_reg_translation:
-            try:
-                friendly_name = remko_reg_translation[reg_name][heatpump._langid]
-            except (IndexError, KeyError):
-                _LOGGER.warning(
-                    "Could not get translation for %s at language index %s",
-                    reg_name,
-                    heatpump._langid,
-                )
+    for spec in BY_PLATFORM["button"]:
+        friendly_name = spec.friendly_name(heatpump._langid)
+        if friendly_name is None:
+            _LOGGER.warning(
+                "Could not get translation for %s at language index %s",
+                spec.name,
+                heatpump._langid,
+            )
 
         entities.append(
             HeatPumpButton(
                 hass=hass,
                 heatpump=heatpump,
-                reg_name=reg_name,
-                reg_id=reg_id,
-                reg_type=reg_type,
-                active=active,
+                reg_name=spec.name,
+                reg_id=spec.key,
+                reg_type=spec.reg_type,
+                active=spec.active,
                 friendly_name=friendly_name,
             )
         )
@@ -16,11 +16,27 @@ from .const import (
     CONF_MQTT_NODE,
     CONF_LANGUAGE,
     CONF_FREQ,
+    CONF_EVENT_INTERVAL,
+    CONF_TEMP_DEADBAND,
+    CONF_POWER_DEADBAND,
+    CONF_HEARTBEAT,
+    CONF_POLICIES,
+    CONF_BATCH_WINDOW,
+    CONF_WRITE_TIMEOUT,
+    CONF_QUERY_TIERS,
+    CONF_FLEET_MODE,
     AVAILABLE_LANGUAGES,
 )
+from .registry import BY_NAME
+from .keepalive import parse_query_tiers
+from .throttle import parse_policies
 
 _LOGGER = logging.getLogger(__name__)
 
+_POSITIVE_FLOAT = vol.All(vol.Coerce(float), vol.Range(min=0))
+_BATCH_WINDOW = vol.All(vol.Coerce(int), vol.Range(min=0, max=2000))
+_WRITE_TIMEOUT = vol.All(vol.Coerce(int), vol.Range(min=1, max=120))
+
 
 class InvalidPostalCode(exceptions.HomeAssistantError):
     """Error to indicate we cannot connect."""
@@ -51,6 +67,7 @@ class DomainConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     ),
                 ),
                 vol.Required(CONF_FREQ, default=60): cv.positive_int,
+                vol.Required(CONF_EVENT_INTERVAL, default=0): cv.positive_int,
             }
         )
 
@@ -83,6 +100,10 @@ class DomainConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Required(
                     CONF_FREQ, default=user_input.get(CONF_FREQ, 60)
                 ): cv.positive_int,
+                vol.Required(
+                    CONF_EVENT_INTERVAL,
+                    default=user_input.get(CONF_EVENT_INTERVAL, 0),
+                ): cv.positive_int,
             }
         )
 
@@ -133,6 +154,7 @@ class DomainConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     CONF_MQTT_NODE: prefix,
                     CONF_LANGUAGE: user_input.get(CONF_LANGUAGE),
                     CONF_FREQ: user_input.get(CONF_FREQ, 60),
+                    CONF_EVENT_INTERVAL: user_input.get(CONF_EVENT_INTERVAL, 0),
                 },
                 options={},
             )
@@ -185,6 +207,42 @@ class OptionsFlow(config_entries.OptionsFlow):
                 vol.Required(
                     CONF_FREQ, default=self._config_entry.data.get(CONF_FREQ)
                 ): cv.positive_int,
+                vol.Required(
+                    CONF_EVENT_INTERVAL,
+                    default=self._config_entry.data.get(CONF_EVENT_INTERVAL, 0),
+                ): cv.positive_int,
+                vol.Required(
+                    CONF_TEMP_DEADBAND,
+                    default=self._config_entry.data.get(CONF_TEMP_DEADBAND, 0.0),
+                ): _POSITIVE_FLOAT,
+                vol.Required(
+                    CONF_POWER_DEADBAND,
+                    default=self._config_entry.data.get(CONF_POWER_DEADBAND, 0.0),
+                ): _POSITIVE_FLOAT,
+                vol.Required(
+                    CONF_HEARTBEAT,
+                    default=self._config_entry.data.get(CONF_HEARTBEAT, 0),
+                ): cv.positive_int,
+                vol.Optional(
+                    CONF_POLICIES,
+                    default=self._config_entry.data.get(CONF_POLICIES, ""),
+                ): cv.string,
+                vol.Required(
+                    CONF_BATCH_WINDOW,
+                    default=self._config_entry.data.get(CONF_BATCH_WINDOW, 0),
+                ): _BATCH_WINDOW,
+                vol.Required(
+                    CONF_WRITE_TIMEOUT,
+                    default=self._config_entry.data.get(CONF_WRITE_TIMEOUT, 10),
+                ): _WRITE_TIMEOUT,
+                vol.Required(
+                    CONF_FLEET_MODE,
+                    default=self._config_entry.data.get(CONF_FLEET_MODE, False),
+                ): cv.boolean,
+                vol.Optional(
+                    CONF_QUERY_TIERS,
+                    default=self._config_entry.data.get(CONF_QUERY_TIERS, ""),
+                ): cv.string,
             }
         )
 
@@ -205,6 +263,33 @@ class OptionsFlow(config_entries.OptionsFlow):
                     ),
                 ),
                 vol.Required(CONF_FREQ, default=user_input[CONF_FREQ]): cv.positive_int,
+                vol.Required(
+                    CONF_EVENT_INTERVAL, default=user_input[CONF_EVENT_INTERVAL]
+                ): cv.positive_int,
+                vol.Required(
+                    CONF_TEMP_DEADBAND, default=user_input[CONF_TEMP_DEADBAND]
+                ): _POSITIVE_FLOAT,
+                vol.Required(
+                    CONF_POWER_DEADBAND, default=user_input[CONF_POWER_DEADBAND]
+                ): _POSITIVE_FLOAT,
+                vol.Required(
+                    CONF_HEARTBEAT, default=user_input[CONF_HEARTBEAT]
+                ): cv.positive_int,
+                vol.Optional(
+                    CONF_POLICIES, default=user_input.get(CONF_POLICIES, "")
+                ): cv.string,
+                vol.Required(
+                    CONF_BATCH_WINDOW, default=user_input[CONF_BATCH_WINDOW]
+                ): _BATCH_WINDOW,
+                vol.Required(
+                    CONF_WRITE_TIMEOUT, default=user_input[CONF_WRITE_TIMEOUT]
+                ): _WRITE_TIMEOUT,
+                vol.Required(
+                    CONF_FLEET_MODE, default=user_input[CONF_FLEET_MODE]
+                ): cv.boolean,
+                vol.Optional(
+                    CONF_QUERY_TIERS, default=user_input.get(CONF_QUERY_TIERS, "")
+                ): cv.string,
             }
         )
 
@@ -248,12 +333,47 @@ class OptionsFlow(config_entries.OptionsFlow):
                 errors={"base": "invalid_language"},
             )
 
+        try:
+            policies = parse_policies(user_input.get(CONF_POLICIES, ""))
+            unknown = [name for name in policies if name not in BY_NAME]
+            if unknown:
+                raise ValueError(f"Unknown registers: {unknown}")
+        except ValueError as ex:
+            _LOGGER.debug("Invalid register policies: %s", ex)
+            return self.async_show_form(
+                step_id="user",
+                data_schema=error_schema,
+                errors={"base": "invalid_policy"},
+            )
+
+        try:
+            _, tiers = parse_query_tiers(user_input.get(CONF_QUERY_TIERS, ""))
+            unknown = [name for name in tiers if name not in BY_NAME]
+            if unknown:
+                raise ValueError(f"Unknown registers: {unknown}")
+        except ValueError as ex:
+            _LOGGER.debug("Invalid query tiers: %s", ex)
+            return self.async_show_form(
+                step_id="user",
+                data_schema=error_schema,
+                errors={"base": "invalid_query_tiers"},
+            )
+
         try:
             data = {
                 CONF_ID: id_name,
                 CONF_MQTT_NODE: prefix,
                 CONF_LANGUAGE: user_input[CONF_LANGUAGE],
                 CONF_FREQ: user_input[CONF_FREQ],
+                CONF_EVENT_INTERVAL: user_input[CONF_EVENT_INTERVAL],
+                CONF_TEMP_DEADBAND: user_input[CONF_TEMP_DEADBAND],
+                CONF_POWER_DEADBAND: user_input[CONF_POWER_DEADBAND],
+                CONF_HEARTBEAT: user_input[CONF_HEARTBEAT],
+                CONF_POLICIES: user_input.get(CONF_POLICIES, ""),
+                CONF_BATCH_WINDOW: user_input[CONF_BATCH_WINDOW],
+                CONF_WRITE_TIMEOUT: user_input[CONF_WRITE_TIMEOUT],
+                CONF_FLEET_MODE: user_input[CONF_FLEET_MODE],
+                CONF_QUERY_TIERS: user_input.get(CONF_QUERY_TIERS, ""),
             }
 
             self.hass.config_entries.async_update_entry(
@@ -11,6 +11,15 @@ CONF_MQTT_NODE = "mqtt_node"
 CONF_LANGUAGE = "language"
 CONF_DATA = "data_msg"
 CONF_FREQ = "freq"
+CONF_EVENT_INTERVAL = "event_interval"
+CONF_TEMP_DEADBAND = "temp_deadband"
+CONF_POWER_DEADBAND = "power_deadband"
+CONF_HEARTBEAT = "heartbeat"
+CONF_POLICIES = "register_policies"
+CONF_BATCH_WINDOW = "batch_window"
+CONF_WRITE_TIMEOUT = "write_timeout"
+CONF_QUERY_TIERS = "query_tiers"
+CONF_FLEET_MODE = "fleet_mode"
 AVAILABLE_LANGUAGES = ["en", "de"]
 
 
@@ -0,0 +1,31 @@
+"""Diagnostics support for Remko-MQTT."""
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_ID
+from .timeprogram_converter import RemkoTimeProgramConverter
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    worker = hass.data[DOMAIN]
+    heatpump = worker.heatpumps[entry.data[CONF_ID]]
+    return {
+        "entry": dict(entry.data),
+        "startup_ms": heatpump.startup_timings,
+        "stats": dict(heatpump.stats),
+        "metrics": heatpump.metrics,
+        "keep_alive": repr(heatpump._keepalive),
+        "session": repr(heatpump._session),
+        "discovery": repr(heatpump._discovery),
+        "fleet": worker.stats,
+        "scheduler": worker.scheduler.stats,
+        "queries": worker.query_gate.stats,
+        "query_spread": worker.query_gate.burst,
+        "timeprogram_cache": RemkoTimeProgramConverter.cache_info(),
+    }
@@ -0,0 +1,68 @@
+"""Incremental discovery of the registers supported by a heat pump."""
+
+from collections.abc import Iterable
+
+
+class CapabilityDiscovery:
+    """Learn supported registers from device reports and background probes.
+
+    Every candidate register is probed with the regular queries.  A register
+    is confirmed as soon as it shows up in a report, and dropped once the
+    device answered max_probes queries without it.
+    """
+
+    def __init__(self, reg_ids: Iterable[str], max_probes: int = 3) -> None:
+        """Initialize discovery with all candidate registers."""
+        self.max_probes = max_probes
+        self.confirmed: set[str] = set()
+        self.dropped: set[str] = set()
+        # Candidate register id -> number of unanswered probes
+        self._candidates: dict[str, int] = dict.fromkeys(reg_ids, 0)
+
+    def __repr__(self) -> str:
+        return (
+            f"CapabilityDiscovery({len(self.confirmed)} confirmed, "
+            f"{len(self._candidates)} probing, {len(self.dropped)} dropped)"
+        )
+
+    @property
+    def complete(self) -> bool:
+        """Return True once every candidate is confirmed or dropped."""
+        return not self._candidates
+
+    @property
+    def candidates(self) -> list[str]:
+        """Return registers still to be probed."""
+        return list(self._candidates)
+
+    def restore(self, confirmed: Iterable[str]) -> None:
+        """Confirm registers known from a previous run."""
+        candidates = self._candidates
+        for reg_id in confirmed:
+            if candidates.pop(reg_id, None) is not None:
+                self.confirmed.add(reg_id)
+
+    def observe(self, reg_ids: Iterable[str]) -> list[str]:
+        """Confirm reported registers.  Returns the newly confirmed ones."""
+        candidates = self._candidates
+        confirmed = [reg_id for reg_id in reg_ids if reg_id in candidates]
+        for reg_id in confirmed:
+            del candidates[reg_id]
+        self.confirmed.update(confirmed)
+        return confirmed
+
+    def probed(self, answered: bool) -> None:
+        """Record a query probing all candidates.
+
+        answered tells whether the device answered the previous query, which
+        probed the candidates too.  Probes of a silent device do not count.
+        """
+        if not answered:
+            return
+        for reg_id, probes in list(self._candidates.items()):
+            probes += 1
+            if probes >= self.max_probes:
+                del self._candidates[reg_id]
+                self.dropped.add(reg_id)
+            else:
+                self._candidates[reg_id] = probes
@@ -1,15 +1,18 @@
 import logging
 import json
 import asyncio
+import random
 import time
 from collections.abc import Callable
-from datetime import timedelta
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.components import mqtt
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 
 from .const import (
     DOMAIN,
@@ -17,18 +20,48 @@ from .const import (
     CONF_MQTT_NODE,
     CONF_LANGUAGE,
     CONF_FREQ,
+    CONF_EVENT_INTERVAL,
+    CONF_TEMP_DEADBAND,
+    CONF_POWER_DEADBAND,
+    CONF_HEARTBEAT,
+    CONF_POLICIES,
+    CONF_BATCH_WINDOW,
+    CONF_WRITE_TIMEOUT,
+    CONF_QUERY_TIERS,
+    CONF_FLEET_MODE,
     AVAILABLE_LANGUAGES,
 )
-from .remko_regs import remko_reg_translation, remko_reg
+from .discovery import CapabilityDiscovery
+from .keepalive import (
+    KeepAliveScheduler,
+    QueryPlanner,
+    SessionTracker,
+    parse_query_tiers,
+)
+from .scheduler import DeadlineScheduler, QueryGate
+from .registry import BY_KEY, BY_NAME, REGISTERS
+from .throttle import RegisterPolicy, ThrottleEngine, parse_policies
 from .timeprogram_converter import RemkoTimeProgramConverter
 
 _LOGGER = logging.getLogger(__name__)
 
 # Constants
 _KEEP_ALIVE_INTERVAL = 30  # seconds
-_WATCHDOG_TIMEOUT = 300  # 5 minutes
-_WATCHDOG_CHECK_INTERVAL = timedelta(minutes=1)
-_MQTT_SLEEP_DURATION = 5  # seconds
+_KEEP_ALIVE_MAX_INTERVAL = 300  # seconds
+_KEEP_ALIVE_JITTER = 0.1  # random delay of keep-alives, share of the interval
+_REQUEST_DELAY = 1  # seconds to collect on-demand register requests
+_STORAGE_VERSION = 1
+_STORAGE_SAVE_DELAY = 60  # seconds between saves of the state cache
+_DEFAULT_WRITE_TIMEOUT = 10  # seconds to wait for the device to confirm a write
+_WRITE_WINDOW = 0.1  # seconds to collect writes into one publish
+
+# Register types rate limited by default
+_THROTTLED_TYPES = {"sensor_el", "sensor_en", "sensor_counter", "sensor_temp"}
+
+
+async def async_remove_state_cache(hass: HomeAssistant, heatpump_id: str) -> None:
+    """Remove the state cache of a heat pump."""
+    await Store(hass, _STORAGE_VERSION, f"{DOMAIN}.{heatpump_id}").async_remove()
 
 
 class HeatPump:
@@ -46,50 +79,176 @@ class HeatPump:
 
         # Configuration
         self._freq = entry.data[CONF_FREQ]
+        self._event_interval = entry.data.get(CONF_EVENT_INTERVAL, 0)
+        self._batch_window = entry.data.get(CONF_BATCH_WINDOW, 0)
+        self._write_timeout = entry.data.get(CONF_WRITE_TIMEOUT, _DEFAULT_WRITE_TIMEOUT)
+        self._read_policy_config(entry)
 
         # Language setup
         lang = entry.data[CONF_LANGUAGE]
         self._langid = AVAILABLE_LANGUAGES.index(lang)
 
         # MQTT configuration
+        self._node = entry.data[CONF_MQTT_NODE]
+        self._fleet_mode = entry.data.get(CONF_FLEET_MODE, False)
         self._mqtt_base = entry.data[CONF_MQTT_NODE] + "/SMTID/"
         self._data_topic = self._mqtt_base + "HOST2CLIENT"
         self._cmd_topic = self._mqtt_base + "CLIENT2HOST"
 
-        # Device state and register mapping
-        self._reg_name = {}
+        # Device state
         self._hpstate = {}
-        self._reg_time = {}
+        self._throttle = ThrottleEngine()
+        self._raw_state: dict[str, str] = {}
+        self._last_payload: str | bytes | None = None
+
+        # Entity update callbacks by register id
+        self._listeners: dict[str, list[Callable[[], None]]] = {}
+
+        # Decoders of all registers and of those with a consumer
+        self._decoder_table: dict[str, tuple[Callable[[str], Any], bool]] = {}
+        self._decoders: dict[str, tuple[Callable[[str], Any], bool]] = {}
         self._build_reverse_lookup()
+        self._build_decoder_table()
 
-        # Device capabilities
-        self._capabilities = []
+        # Public register change event (opt-in, rate limited)
+        self._event_pending: dict[str, Any] = {}
+        self._event_last = 0.0
+        self._event_unsub: Callable[[], None] | None = None
+
+        # Batching window for incoming values
+        self._batch_values: dict[str, str] = {}
+        self._batch_payload: str | bytes | None = None
+        self._batch_unsub: Callable[[], None] | None = None
+
+        # Outgoing register writes, collected for one publish
+        self._write_values: dict[str, Any] = {}
+        self._write_done: asyncio.Future | None = None
+        self._write_unsub: Callable[[], None] | None = None
+        # Register id -> [device value, pending writes] of optimistic states
+        self._optimistic: dict[str, list] = {}
+        # Register id -> (expected value, future) of writes awaiting the device
+        self._write_acks: dict[str, list[tuple[Any, asyncio.Future]]] = {}
+
+        # State cache for a warm start
+        self._store: Store[dict[str, Any]] = Store(
+            hass, _STORAGE_VERSION, f"{DOMAIN}.{self._id}"
+        )
+        self._save_pending = False
+        self._last_seen: float | None = None  # wall clock of the last report
+
+        # Device capabilities, confirmed while running
+        self._discovery = CapabilityDiscovery(
+            spec.key for spec in REGISTERS if spec.decoder is not None
+        )
+        self._capabilities = self._discovery.confirmed
 
         # MQTT subscriptions
         self._unsub_data: Callable[[], None] | None = None
         self._unsub_cmd: Callable[[], None] | None = None
         self._watchdog_unsub: Callable[[], None] | None = None
+        # Keep-alive deadline the watchdog is armed for, without jitter
+        self._keep_alive_at: float | None = None
 
         # Timing and counters
-        self._last_time = time.time()
-        self._keep_alive_delay = time.time() - _KEEP_ALIVE_INTERVAL
-        self._mqtt_counter = entry.data[CONF_FREQ]
+        self._keepalive = KeepAliveScheduler(
+            _KEEP_ALIVE_INTERVAL, _KEEP_ALIVE_MAX_INTERVAL
+        )
+        self._planner = QueryPlanner()
+        self._session = SessionTracker()
+        self._read_query_tiers(entry)
+        # Startup phases, milliseconds since the entry was set up
+        self._setup_start = time.monotonic()
+        self._startup: dict[str, int | None] = dict.fromkeys(
+            ("subscribed", "platforms_ready", "first_message", "entities_ready")
+        )
+        self._stats = {
+            "messages_received": 0,
+            "bytes_received": 0,
+            "payloads_received": 0,
+            "payloads_duplicate": 0,
+            "registers_changed": 0,
+            "registers_unchanged": 0,
+            "registers_throttled": 0,
+            "keep_alives_sent": 0,
+            "session_opens": 0,
+            "read_queries": 0,
+            "writes_requested": 0,
+            "writes_published": 0,
+            "writes_confirmed": 0,
+            "writes_timed_out": 0,
+            "writes_rolled_back": 0,
+            "write_latency_last_ms": 0,
+            "write_latency_avg_ms": 0,
+            "write_latency_max_ms": 0,
+            "publishes_sent": 0,
+            "publish_latency_avg_ms": 0,
+            "publish_latency_max_ms": 0,
+        }
+        # Messages of the current and the previous minute
+        self._rate_start = time.monotonic()
+        self._rate_count = 0
+        self._rate_last = 0
+        # Timings are only taken while a diagnostic sensor shows them.
+        # "json" or register type -> [total seconds, count]
+        self._profiling = 0
+        self._timings: dict[str, list] = {}
+
+    def _read_policy_config(self, entry: ConfigEntry) -> None:
+        """Read update policy settings from config entry."""
+        self._temp_deadband = entry.data.get(CONF_TEMP_DEADBAND, 0.0)
+        self._power_deadband = entry.data.get(CONF_POWER_DEADBAND, 0.0)
+        self._heartbeat = entry.data.get(CONF_HEARTBEAT, 0)
+        try:
+            self._policy_overrides = parse_policies(entry.data.get(CONF_POLICIES, ""))
+        except ValueError as err:
+            _LOGGER.error("Ignoring register policies: %s", err)
+            self._policy_overrides = {}
+
+    def _read_query_tiers(self, entry: ConfigEntry) -> None:
+        """Read polling tiers from config entry."""
+        try:
+            cycles, tiers = parse_query_tiers(entry.data.get(CONF_QUERY_TIERS, ""))
+        except ValueError as err:
+            _LOGGER.error("Ignoring query tiers: %s", err)
+            cycles, tiers = {}, {}
+
+        tier_by_id = {}
+        for spec in REGISTERS:
+            tier_by_id[spec.key] = tiers.get(spec.name, spec.tier)
+        self._planner.configure(tier_by_id, cycles)
+
+    def _default_policy(self, reg_type: str) -> RegisterPolicy | None:
+        """Return update policy for a register type from the global settings."""
+        if reg_type not in _THROTTLED_TYPES:
+            return None
+        if reg_type == "sensor_temp":
+            return RegisterPolicy(
+                self._freq, self._temp_deadband, heartbeat=self._heartbeat
+            )
+        if reg_type == "sensor_el":
+            return RegisterPolicy(
+                self._freq, self._power_deadband, True, self._heartbeat
+            )
+        return RegisterPolicy(self._freq, heartbeat=self._heartbeat)
 
     def _build_reverse_lookup(self) -> None:
-        """Build reverse lookup dictionary for register mapping."""
-        for name, data in remko_reg.items():
-            self._reg_name[data[0]] = name
-            self._hpstate[data[0]] = "unknown"
+        """Seed state for all known registers."""
+        for spec in REGISTERS:
+            self._hpstate[spec.key] = "unknown"
 
     async def message_received(self, message) -> None:
         """Handle new MQTT messages."""
         _LOGGER.debug("[%s] MQTT message received:  topic=%s", self._id, message.topic)
+        stats = self._stats
+        stats["messages_received"] += 1
+        stats["bytes_received"] += len(message.payload)
+        now = time.monotonic()
+        if now - self._rate_start >= 60:
+            self._rate_last = self._rate_count if now - self._rate_start < 120 else 0
+            self._rate_start = now
+            self._rate_count = 0
+        self._rate_count += 1
         try:
-            # if self._mqtt_counter >= self._freq:
-            #    await self._process_message(message)
-            #    self._mqtt_counter = 0
-            # else:
-            #    self._mqtt_counter += 1
             await self._process_message(message)
         except ValueError:
             _LOGGER.error(
@@ -104,155 +263,428 @@ class HeatPump:
                 _LOGGER.debug(
                     "Message from other client, delaying query_list for 30 seconds"
                 )
-                self._keep_alive_delay = time.time()
+                self._keepalive.defer(time.monotonic())
+                # The other client may have changed the session
+                self._session.expire()
                 return
 
         # Process data from heat pump
         if message.topic == self._data_topic:
-            self._last_time = time.time()
-            json_dict = json.loads(message.payload).get("values", {})
-
-            for register_id, value in json_dict.items():
-                if register_id in self._reg_name:
-                    self._update_hpstate(register_id, value)
-
-            self._hass.bus.fire(f"{self._domain}_{self._id}_msg_rec_event", {})
-            await self.mqtt_keep_alive()
-
-    def _update_hpstate(self, reg_id: str, value: str) -> None:
-        """Update heat pump state with converted register value."""
-        _LOGGER.debug("[%s] Register %s:  %s", self._id, reg_id, value)
-        reg_type = remko_reg[self._reg_name[reg_id]][1]
-
-        if reg_type == "switch":
-            self._hpstate[reg_id] = int(value, 16) > 0
-        elif reg_type == "timeprogram":
-            self._hpstate[reg_id] = RemkoTimeProgramConverter.hex_to_timeprogram(value)
-        elif reg_type == "sensor_el":
-            if (
-                reg_id not in self._reg_time
-                or time.time() - self._reg_time[reg_id] > self._freq
-            ):
-                self._reg_time[reg_id] = time.time()
-                self._hpstate[reg_id] = int(value, 16) * 100
-        elif reg_type in ("sensor_en", "sensor_counter"):
+            self._keepalive.observe(time.monotonic())
+            self._gate.answered(self._id)
+            # The report may bring the overdue deadline before the armed one
             if (
-                reg_id not in self._reg_time
-                or time.time() - self._reg_time[reg_id] > self._freq
+                self._keep_alive_at is not None
+                and self._keepalive.next_query() < self._keep_alive_at
             ):
-                self._reg_time[reg_id] = time.time()
-                self._hpstate[reg_id] = int(value, 16)
-        elif reg_type == "sensor_temp":
-            if (
-                reg_id not in self._reg_time
-                or time.time() - self._reg_time[reg_id] > self._freq
+                self._schedule_keep_alive()
+            if self._startup["first_message"] is None:
+                self._startup_phase("first_message")
+            stats = self._stats
+            stats["payloads_received"] += 1
+
+            # Byte-identical repeat of the last fully applied payload,
+            # still parsed while writes wait for their confirmation
+            payload = message.payload
+            if not self._write_acks and (
+                payload == self._last_payload or payload == self._batch_payload
             ):
-                self._reg_time[reg_id] = time.time()
-                raw = int(value, 16)
-                self._hpstate[reg_id] = (-(raw & 0x8000) | (raw & 0x7FFF)) / 10
-        elif reg_type == "sensor_temp_inp":
-            raw = int(value, 16)
-            self._hpstate[reg_id] = (-(raw & 0x8000) | (raw & 0x7FFF)) / 10
-        elif reg_type == "sensor_mode":
-            mode = f"opmode{int(value, 16)}"
-            self._hpstate[reg_id] = remko_reg_translation[mode][self._langid]
-        elif reg_type == "select_input":
-            self._hpstate[reg_id] = self._get_select_mode(self._reg_name[reg_id], value)
-
-    def _get_select_mode(self, reg_id: str, value: str) -> str:
-        """Get select mode display name from register value."""
-        int_value = int(value, 16)
-        mode_map = {
-            "main_mode": f"mode{int_value}",
-            "dhw_opmode": f"dhwopmode{int_value}",
-            "timemode": f"timemode{int_value}",
-            "user_profile": f"user_profile{int_value}",
-        }
-        mode = mode_map.get(reg_id, f"mode{int_value}")
-        return remko_reg_translation[mode][self._langid]
+                stats["payloads_duplicate"] += 1
+                return
 
-    async def check_capabilities(self) -> bool:
-        """Check capabilities/possible register IDs from heat pump."""
-        # Capablility check disbaled for now, since not all values are reported correctly
-        self._capabilities = list(self._reg_name.keys())
-        """
-        query_list = [int(key) for key in self._reg_name]
-        payload = json.dumps(
-            {
-                "FORCE_RESPONSE": True,
-                "values": {"5074": "0255", "5106": "0000", "5109": "0000"},
-                "query_list": query_list,
-            }
-        )
-        await mqtt.async_publish(
+            if self._profiling:
+                start = time.perf_counter()
+                json_dict = json.loads(payload).get("values", {})
+                self._record_timing("json", time.perf_counter() - start)
+            else:
+                json_dict = json.loads(payload).get("values", {})
+            if not self._discovery.complete:
+                self._discover(json_dict)
+            if self._write_acks:
+                self._confirm_writes(json_dict)
+
+            if self._batch_window:
+                # Merge into the current window, latest value wins
+                self._batch_values.update(json_dict)
+                self._batch_payload = payload
+                if self._batch_unsub is None:
+                    self._batch_unsub = async_call_later(
+                        self._hass, self._batch_window / 1000, self._flush_batch
+                    )
+            else:
+                self._apply_values(json_dict, payload)
+
+    @callback
+    def _discover(self, values: dict[str, str]) -> None:
+        """Confirm reported registers and announce them to the platforms."""
+        confirmed = self._discovery.observe(values)
+        if not confirmed:
+            return
+        _LOGGER.debug("[%s] Registers discovered: %s", self._id, confirmed)
+        self._schedule_save()
+        async_dispatcher_send(
             self._hass,
-            self._cmd_topic,
-            payload=payload,
-            qos=2,
-            retain=False,
+            self.new_registers_signal,
+            [BY_KEY[reg_id] for reg_id in confirmed],
         )
 
-        future: asyncio.Future = asyncio.Future()
+    @callback
+    def _confirm_writes(self, values: dict[str, str]) -> None:
+        """Resolve pending writes whose register reports the written value."""
+        for reg_id, waiters in self._write_acks.items():
+            raw = values.get(reg_id)
+            if raw is None:
+                continue
+            value = BY_KEY[reg_id].decoder(raw)
+            for expected, future in waiters:
+                if not future.done() and value == expected:
+                    future.set_result(None)
 
-        @callback
-        def message_handler(msg) -> None:
-            #Handle capability response.
-            if not future.done() and not future.cancelled():
-                try:
-                    future.set_result(msg.payload)
-                except (asyncio.InvalidStateError, RuntimeError) as e:
-                    _LOGGER.warning("Could not set future result (late message): %s", e)
+    @callback
+    def _flush_batch(self, _now=None) -> None:
+        """Apply the values merged during the batching window."""
+        self._batch_unsub = None
+        values, self._batch_values = self._batch_values, {}
+        payload, self._batch_payload = self._batch_payload, None
+        if values:
+            self._apply_values(values, payload)
 
-        unsub = await mqtt.async_subscribe(
-            self._hass, self._data_topic, message_handler
-        )
+    @callback
+    def _apply_values(self, values: dict[str, str], payload: str | bytes) -> None:
+        """Decode register values and notify the entities of changed ones."""
+        stats = self._stats
+        throttled = stats["registers_throttled"]
+        raw_state = self._raw_state
+        changed = []
+        for register_id, value in values.items():
+            if register_id not in self._decoders:
+                continue
+            if raw_state.get(register_id) == value:
+                stats["registers_unchanged"] += 1
+            elif self._update_hpstate(register_id, value):
+                changed.append(register_id)
+        stats["registers_changed"] += len(changed)
 
-        try:
-            reply = await asyncio.wait_for(future, timeout=30.0)
-            json_dict = json.loads(reply).get("values", {})
-            self._capabilities = list(json_dict.keys())
-            return True
-        except TimeoutError:
-            _LOGGER.error(
-                "Timeout waiting for capabilities response from heat pump.  "
-                "Check:  1) MQTT broker running, 2) Heat pump connected, 3) Correct MQTT node"
+        # Only remember payloads that were applied completely
+        if stats["registers_throttled"] == throttled:
+            self._last_payload = payload
+        else:
+            self._last_payload = None
+
+        self._notify_listeners(changed)
+        if changed:
+            self._schedule_save()
+            if self._event_interval:
+                self._queue_changed_event(changed)
+
+    def _build_decoder_table(self) -> None:
+        """Build register id -> (decoder, throttled) table for incoming values."""
+        self._decoder_table = {}
+        self._throttle.clear()
+        for spec in REGISTERS:
+            if spec.decoder is None:
+                continue
+            policy = self._policy_overrides.get(spec.name) or self._default_policy(
+                spec.reg_type
             )
-            self._capabilities = list(self._reg_name.keys())
+            # Values of registers without any limit skip the throttle
+            if policy is not None and policy.unlimited:
+                policy = None
+            if policy is not None:
+                self._throttle.set_policy(spec.key, policy)
+            self._decoder_table[spec.key] = (spec.decoder, policy is not None)
+        self._update_active_decoders()
+
+    @property
+    def _all_consumed(self) -> bool:
+        """Return True if every register is needed, not only listened ones."""
+        # The public change event reports all registers, and without any
+        # entity yet nothing is known about the consumers
+        return bool(self._event_interval) or not self._listeners
+
+    def _update_active_decoders(self) -> None:
+        """Decode only registers with at least one consumer."""
+        previous = self._decoders
+        if self._all_consumed:
+            self._decoders = self._decoder_table
+        else:
+            self._decoders = {
+                reg_id: entry
+                for reg_id, entry in self._decoder_table.items()
+                if reg_id in self._listeners
+            }
+        # The last payload was applied without the new registers, take the
+        # next repeat of it in full
+        if not self._decoders.keys() <= previous.keys():
+            self._last_payload = None
+
+    def _update_hpstate(self, reg_id: str, value: str) -> bool:
+        """Update heat pump state with converted register value.
+
+        Returns True if the stored value changed.
+        """
+        _LOGGER.debug("[%s] Register %s:  %s", self._id, reg_id, value)
+        decoder, throttled = self._decoders[reg_id]
+        if self._profiling:
+            start = time.perf_counter()
+            new_value = decoder(value)
+            self._record_timing(BY_KEY[reg_id].reg_type, time.perf_counter() - start)
+        else:
+            new_value = decoder(value)
+
+        if throttled and not self._throttle.accept(reg_id, new_value, time.monotonic()):
+            self._stats["registers_throttled"] += 1
             return False
-        except asyncio.CancelledError:
-            _LOGGER.warning("Capability check was cancelled (likely during shutdown)")
-            raise
-        except Exception:
-            _LOGGER.exception("Unexpected error during capability check")
-            self._capabilities = list(self._reg_name.keys())
+
+        self._raw_state[reg_id] = value
+        if self._optimistic:
+            pending = self._optimistic.get(reg_id)
+            if pending is not None:
+                # Keep the optimistic value, remember the device value for a
+                # rollback
+                pending[0] = new_value
+                return False
+
+        hpstate = self._hpstate
+        old_value = hpstate.get(reg_id)
+        if old_value is new_value or old_value == new_value:
             return False
-        finally:
-            unsub()
-        """
+        hpstate[reg_id] = new_value
         return True
 
-    async def setup_mqtt(self) -> None:
-        """Initialize MQTT subscriptions and watchdog."""
-        self._unsub_data = await mqtt.async_subscribe(
-            self._hass,
-            self._data_topic,
-            self.message_received,
+    def _record_timing(self, kind: str, seconds: float) -> None:
+        """Add a parse or decode time to the totals."""
+        timing = self._timings.get(kind)
+        if timing is None:
+            self._timings[kind] = [seconds, 1]
+        else:
+            timing[0] += seconds
+            timing[1] += 1
+
+    @callback
+    def async_enable_profiling(self) -> Callable[[], None]:
+        """Take parse and decode timings until the returned function is called."""
+        self._profiling += 1
+
+        @callback
+        def disable_profiling() -> None:
+            self._profiling -= 1
+
+        return disable_profiling
+
+    @callback
+    def async_add_listener(
+        self, reg_id: str, update_callback: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Listen for changes of a register.  Returns a remove function.
+
+        Registers without listeners are neither decoded nor queried, unless
+        the change event is enabled.
+        """
+        listeners = self._listeners.get(reg_id)
+        if listeners is None:
+            listeners = self._listeners[reg_id] = []
+            self._update_active_decoders()
+            # Fetch the value now, e.g. after an entity was enabled
+            self.async_request_registers([reg_id])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            listeners = self._listeners.get(reg_id)
+            if listeners and update_callback in listeners:
+                listeners.remove(update_callback)
+                if not listeners:
+                    del self._listeners[reg_id]
+                    self._update_active_decoders()
+
+        return remove_listener
+
+    @callback
+    def _notify_listeners(self, reg_ids: list[str]) -> None:
+        """Call the listeners bound to the changed registers."""
+        for reg_id in reg_ids:
+            for update_callback in self._listeners.get(reg_id, ()):
+                update_callback()
+
+    @property
+    def refresh_signal(self) -> str:
+        """Return dispatcher signal for a full entity refresh."""
+        return f"{self._domain}_{self._id}_refresh"
+
+    @property
+    def new_registers_signal(self) -> str:
+        """Return dispatcher signal announcing newly confirmed registers."""
+        return f"{self._domain}_{self._id}_new_registers"
+
+    @callback
+    def async_refresh_entities(self) -> None:
+        """Ask all entities of this heat pump to refresh their state."""
+        async_dispatcher_send(self._hass, self.refresh_signal)
+
+    @callback
+    def _queue_changed_event(self, reg_ids: list[str]) -> None:
+        """Queue changed registers for the public change event."""
+        for reg_id in reg_ids:
+            spec = BY_KEY[reg_id]
+            value = self._hpstate[reg_id]
+            if isinstance(value, bytes):
+                value = self.get_timeprogram(reg_id)
+            elif spec.options is not None:
+                value = spec.label(value, self._langid)
+            self._event_pending[spec.name] = value
+
+        if self._event_unsub is not None:
+            return
+
+        delay = self._event_last + self._event_interval - time.monotonic()
+        if delay <= 0:
+            self._fire_changed_event()
+        else:
+            self._event_unsub = async_call_later(
+                self._hass, delay, self._fire_changed_event
+            )
+
+    @callback
+    def _fire_changed_event(self, _now=None) -> None:
+        """Fire the public event with the registers changed since the last one."""
+        self._event_unsub = None
+        if not self._event_pending:
+            return
+        self._event_last = time.monotonic()
+        self._hass.bus.async_fire(
+            f"{self._domain}_{self._id}_registers_changed",
+            {"registers": self._event_pending},
         )
-        self._unsub_cmd = await mqtt.async_subscribe(
-            self._hass,
-            self._cmd_topic,
-            self.message_received,
+        self._event_pending = {}
+
+    async def async_load_state(self) -> None:
+        """Restore state and capabilities saved by the previous run."""
+        try:
+            data = await self._store.async_load()
+        except HomeAssistantError as err:
+            _LOGGER.warning("[%s] Could not load state cache: %s", self._id, err)
+            return
+        if not data:
+            return
+
+        # Raw values are kept, so the decoding may change between versions
+        for reg_id, raw in data.get("raw_state", {}).items():
+            entry = self._decoder_table.get(reg_id)
+            if entry is None:
+                continue
+            try:
+                value = entry[0](raw)
+            except (TypeError, ValueError):
+                continue
+            self._raw_state[reg_id] = raw
+            self._hpstate[reg_id] = value
+
+        self._discovery.restore(data.get("capabilities", []))
+        if data.get("report_interval"):
+            self._keepalive.report_interval = data["report_interval"]
+        self._last_seen = data.get("last_seen")
+        _LOGGER.debug(
+            "[%s] Restored %d registers, last seen %s",
+            self._id,
+            len(self._raw_state),
+            self._last_seen,
         )
 
-        self._hass.async_create_task(self.watchdog())
+    @callback
+    def _schedule_save(self) -> None:
+        """Save the state cache soon, at most once per save delay."""
+        if not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, _STORAGE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return state cache to store."""
+        self._save_pending = False
+        if self._keepalive.last_seen is not None:
+            self._last_seen = time.time() - (
+                time.monotonic() - self._keepalive.last_seen
+            )
+        return {
+            "raw_state": dict(self._raw_state),
+            "capabilities": sorted(self._discovery.confirmed),
+            "report_interval": self._keepalive.report_interval,
+            "last_seen": self._last_seen,
+        }
 
-        await asyncio.sleep(_MQTT_SLEEP_DURATION)
-        self._mqtt_counter = self._freq
-        self._hass.bus.fire(f"{self._domain}_{self._id}_msg_rec_event", {})
+    @callback
+    def _startup_phase(self, phase: str) -> None:
+        """Record a startup phase, entities are ready after data and platforms."""
+        startup = self._startup
+        if startup[phase] is not None:
+            return
+        startup[phase] = round((time.monotonic() - self._setup_start) * 1000)
+        _LOGGER.debug(
+            "[%s] Startup phase %s after %d ms", self._id, phase, startup[phase]
+        )
+        if (
+            startup["first_message"] is not None
+            and startup["platforms_ready"] is not None
+        ):
+            startup["entities_ready"] = max(
+                startup["first_message"], startup["platforms_ready"]
+            )
+            # Show the first data on entities restored from the cache
+            self.async_refresh_entities()
+
+    @callback
+    def async_platforms_ready(self) -> None:
+        """Record that all entity platforms are set up."""
+        self._startup_phase("platforms_ready")
+
+    @property
+    def startup_timings(self) -> dict[str, int | None]:
+        """Return milliseconds from entry setup to each startup phase."""
+        return dict(self._startup)
+
+    async def setup_mqtt(self) -> None:
+        """Initialize MQTT subscriptions, then query the device.
+
+        Entities are refreshed once the first data arrives, see
+        _startup_phase.
+        """
+        if self._fleet_mode and "/" not in self._node:
+            # Both topics arrive through the shared subscription of the worker
+            self._unsub_data = await self._hass.data[DOMAIN].async_add_route(
+                self._node, self.message_received
+            )
+        else:
+            if self._fleet_mode:
+                _LOGGER.debug(
+                    "[%s] MQTT node %s has several levels, not using the shared "
+                    "subscription",
+                    self._id,
+                    self._node,
+                )
+            self._unsub_data, self._unsub_cmd = await asyncio.gather(
+                mqtt.async_subscribe(
+                    self._hass, self._data_topic, self.message_received
+                ),
+                mqtt.async_subscribe(
+                    self._hass, self._cmd_topic, self.message_received
+                ),
+            )
+        self._startup_phase("subscribed")
+
+        # Query right away, the answer arrives on the new subscription
+        await self.watchdog()
 
     async def remove_mqtt(self) -> None:
         """Remove all MQTT subscriptions."""
-        unsubs = [self._unsub_data, self._unsub_cmd, self._watchdog_unsub]
+        unsubs = [
+            self._unsub_data,
+            self._unsub_cmd,
+            self._watchdog_unsub,
+            self._event_unsub,
+            self._batch_unsub,
+            self._write_unsub,
+        ]
         for unsub in unsubs:
             if unsub is not None:
                 try:
@@ -263,19 +695,51 @@ class HeatPump:
         self._unsub_data = None
         self._unsub_cmd = None
         self._watchdog_unsub = None
+        self._keep_alive_at = None
+        self._event_unsub = None
+        self._batch_unsub = None
+        self._batch_values = {}
+        self._batch_payload = None
+        self._session.expire()
+        if DOMAIN in self._hass.data:
+            self._gate.remove(self._id)
+
+        # Do not lose writes still waiting for their window
+        self._flush_writes()
+
+    async def update_config(self, entry: ConfigEntry) -> bool:
+        """Update configuration from config entry.
 
-    async def update_config(self, entry: ConfigEntry) -> None:
-        """Update configuration from config entry."""
-        # Clean up existing subscriptions
-        await self.remove_mqtt()
+        Returns True if the MQTT subscriptions have to be set up again.
+        """
+        mqtt_base = entry.data[CONF_MQTT_NODE] + "/SMTID/"
+        fleet_mode = entry.data.get(CONF_FLEET_MODE, False)
+        resubscribe = (
+            mqtt_base != self._mqtt_base
+            or fleet_mode != self._fleet_mode
+            or self._unsub_data is None
+        )
+        if resubscribe:
+            # Clean up existing subscriptions
+            await self.remove_mqtt()
 
         # Update configuration
         lang = entry.data[CONF_LANGUAGE]
         self._langid = AVAILABLE_LANGUAGES.index(lang)
-        self._mqtt_base = entry.data[CONF_MQTT_NODE] + "/SMTID/"
+        self._node = entry.data[CONF_MQTT_NODE]
+        self._fleet_mode = fleet_mode
+        self._mqtt_base = mqtt_base
         self._data_topic = self._mqtt_base + "HOST2CLIENT"
         self._cmd_topic = self._mqtt_base + "CLIENT2HOST"
         self._freq = entry.data[CONF_FREQ]
+        self._event_interval = entry.data.get(CONF_EVENT_INTERVAL, 0)
+        self._batch_window = entry.data.get(CONF_BATCH_WINDOW, 0)
+        self._write_timeout = entry.data.get(CONF_WRITE_TIMEOUT, _DEFAULT_WRITE_TIMEOUT)
+        self._read_policy_config(entry)
+        self._read_query_tiers(entry)
+        self._build_decoder_table()
+        # Throttled values of the last payload may pass the new policies
+        self._last_payload = None
 
         _LOGGER.debug(
             "Heat pump %s configured with MQTT node:  %s, language: %s",
@@ -284,7 +748,10 @@ class HeatPump:
             self._langid,
         )
 
-        await self.mqtt_keep_alive()
+        if not resubscribe:
+            # Option labels are translated on render, no need to decode again
+            self.async_refresh_entities()
+        return resubscribe
 
     async def async_reset(self) -> bool:
         """Reset heat pump to default state."""
@@ -295,99 +762,362 @@ class HeatPump:
         """Return current heat pump state."""
         return self._hpstate
 
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return message processing and write counters."""
+        return self._stats
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return performance metrics of the diagnostic sensors."""
+        now = time.monotonic()
+        stats = self._stats
+        elapsed = now - self._rate_start
+        if elapsed >= 120:
+            per_minute = 0
+        elif elapsed >= 60:
+            per_minute = self._rate_count
+        else:
+            per_minute = self._rate_last
+
+        # Mean times in microseconds
+        timings = {
+            kind: round(total / count * 1e6, 1)
+            for kind, (total, count) in self._timings.items()
+        }
+        decode = [timing for kind, timing in self._timings.items() if kind != "json"]
+        decode_count = sum(count for _, count in decode)
+
+        last_seen = self._keepalive.last_seen
+        return {
+            "messages_per_minute": per_minute,
+            "bytes_received": stats["bytes_received"],
+            "json_parse_time": timings.pop("json", None),
+            "decode_time": (
+                round(sum(total for total, _ in decode) / decode_count * 1e6, 1)
+                if decode_count
+                else None
+            ),
+            "decode_time_by_type": timings,
+            "registers_changed": stats["registers_changed"],
+            "registers_unchanged": stats["registers_unchanged"],
+            "registers_throttled": stats["registers_throttled"],
+            "publishes_sent": stats["publishes_sent"],
+            "publish_latency": stats["publish_latency_avg_ms"],
+            "last_message_age": (
+                round(now - last_seen) if last_seen is not None else None
+            ),
+        }
+
+    def has_value(self, reg_id: str) -> bool:
+        """Return True if the register holds a reported or restored value."""
+        return reg_id in self._raw_state or reg_id in self._optimistic
+
+    def get_timeprogram(self, reg_id: str) -> dict | None:
+        """Return time program dict for a timeprogram register.
+
+        The state only holds the slot mask, the dict comes from the cache of
+        the converter and is shared: callers must not modify it.
+        """
+        mask = self._hpstate.get(reg_id)
+        if not isinstance(mask, bytes):
+            return None
+        return RemkoTimeProgramConverter.mask_to_timeprogram_cached(mask)
+
+    def get_label(self, reg_id: str) -> str | None:
+        """Return translated label of an option register's current code."""
+        spec = BY_KEY.get(reg_id)
+        if spec is None:
+            return None
+        return spec.label(self._hpstate.get(reg_id), self._langid)
+
+    def get_options(self, reg_id: str) -> tuple[str, ...]:
+        """Return translated labels of all codes of an option register."""
+        spec = BY_KEY.get(reg_id)
+        if spec is None or spec.options is None:
+            return ()
+        return spec.options[self._langid]
+
+    def get_option_code(self, reg_id: str, label: str) -> int | None:
+        """Return code of a translated option label."""
+        spec = BY_KEY.get(reg_id)
+        return spec.code(label, self._langid) if spec is not None else None
+
     def get_value(self, item: str) -> Any:
         """Get value for sensor."""
         res = self._hpstate.get(item)
         _LOGGER.debug("get_value(%s)=%s", item, res)
         return res
 
-    def update_state(self, command: str, state_command: str) -> None:
-        """Send MQTT message to heat pump."""
-        _LOGGER.debug("update_state:  %s %s", command, state_command)
+    async def async_write_register(self, reg_name: str, value: Any) -> bool:
+        """Write register value, showing it in the state right away.
+
+        The optimistic value is kept while the write is pending and rolled
+        back to the device value if the device does not confirm it.
+        Returns True if the device confirmed the write.
+        """
+        spec = BY_NAME.get(reg_name)
+        if spec is None or spec.decoder is None or value is None:
+            # Nothing to show, e.g. actions
+            return await self.send_mqtt_reg(reg_name, value)
+
+        reg_id = spec.key
+        pending = self._optimistic.get(reg_id)
+        if pending is None:
+            pending = self._optimistic[reg_id] = [self._hpstate.get(reg_id), 0]
+        pending[1] += 1
+
+        # State as it will be decoded from the device report
+        self._hpstate[reg_id] = spec.decoder(spec.encoder(value))
+        self._notify_listeners([reg_id])
+
+        confirmed = False
+        try:
+            confirmed = await self.send_mqtt_reg(reg_name, value)
+        finally:
+            pending[1] -= 1
+            if not pending[1]:
+                del self._optimistic[reg_id]
+                # Device value is in the state if the write was confirmed
+                if not confirmed and self._hpstate.get(reg_id) != pending[0]:
+                    _LOGGER.warning(
+                        "Rolling back %s to the device value %s", reg_name, pending[0]
+                    )
+                    self._stats["writes_rolled_back"] += 1
+                    self._hpstate[reg_id] = pending[0]
+                    self._notify_listeners([reg_id])
+        return confirmed
 
-    async def send_mqtt_reg(self, reg_name: str, value: Any) -> None:
-        """Send register value to heat pump via MQTT."""
+    async def send_mqtt_reg(self, reg_name: str, value: Any) -> bool:
+        """Send register value to heat pump via MQTT.
+
+        Returns True once the device reports the written value, False if it
+        did not within the write timeout.
+        """
         if value is None:
             _LOGGER.error("Cannot send register - value is None:  %s", reg_name)
-            return
+            return False
 
-        reg_id = remko_reg[reg_name][0]
-        reg_type = remko_reg[reg_name][1]
-        if reg_id not in self._reg_name:
-            _LOGGER.error("Unknown register: %s", reg_id)
-            return
+        spec = BY_NAME.get(reg_name)
+        if spec is None:
+            _LOGGER.error("Unknown register: %s", reg_name)
+            return False
 
-        _LOGGER.debug("Sending register:  %s (type: %s)", reg_id, reg_type)
+        _LOGGER.debug("Queueing register:  %s (type: %s)", spec.key, spec.reg_type)
 
-        payload = self._build_mqtt_payload(reg_id, reg_type, reg_name, value)
+        # Last write wins within the window
+        self._write_values[spec.key] = spec.encoder(value)
+        self._stats["writes_requested"] += 1
+        if self._write_done is None:
+            self._write_done = self._hass.loop.create_future()
+            self._write_unsub = async_call_later(
+                self._hass, _WRITE_WINDOW, self._flush_writes
+            )
 
-        _LOGGER.debug("MQTT topic: %s, payload: %s", self._cmd_topic, payload)
+        # Shield the shared future from a cancelled caller
+        return await asyncio.shield(self._write_done)
 
-        self._hass.async_create_task(
-            mqtt.async_publish(
-                self._hass, self._cmd_topic, payload, qos=2, retain=False
+    @callback
+    def _flush_writes(self, _now=None) -> None:
+        """Publish the writes collected during the window in one message."""
+        self._write_unsub = None
+        values, self._write_values = self._write_values, {}
+        done, self._write_done = self._write_done, None
+        if done is None:
+            return
+        # Ask for the written registers, so the device confirms them right away
+        query_list = [
+            BY_KEY[reg_id].id for reg_id in values if BY_KEY[reg_id].decoder is not None
+        ]
+        if query_list:
+            payload = json.dumps(
+                {"FORCE_RESPONSE": True, "values": values, "query_list": query_list}
             )
+        else:
+            payload = json.dumps({"values": values})
+        self._hass.async_create_task(
+            self._async_publish_writes(self._cmd_topic, payload, values, done)
         )
 
-        await asyncio.sleep(_MQTT_SLEEP_DURATION)
-        self._mqtt_counter = self._freq
-        self._hass.bus.fire(f"{self._domain}_{self._id}_msg_rec_event", {})
-
-    def _build_mqtt_payload(
-        self, reg_id: str, reg_type: str, reg_name: str, value: Any
-    ) -> str:
-        """Build MQTT payload based on reg_type."""
-        if reg_type == "timeprogram":
-            return json.dumps({"values": {reg_id: value}})
-        if reg_type == "sensor_temp_inp":
-            hex_str = hex(int(value * 10)).upper()[2:].zfill(4)
-            return json.dumps({"values": {reg_id: hex_str}})
-
-        if reg_type == "select_input":
-            int_value = int(value) + (1 if reg_name == "main_mode" else 0)
-            return json.dumps({"values": {reg_id: str(int_value).zfill(2)}})
-        if reg_type in ("switch", "action"):
-            hex_str = hex(int(value))[2:].zfill(2)
-            return json.dumps({"values": {reg_id: hex_str}})
-
-        return json.dumps({"values": {reg_id: value}})
+    async def _async_publish_writes(
+        self, topic: str, payload: str, values: dict[str, Any], done: asyncio.Future
+    ) -> None:
+        """Publish writes and release the callers once the device confirmed."""
+        # Register expected values before publishing, the device is fast
+        acks = []
+        for reg_id, raw in values.items():
+            decoder = BY_KEY[reg_id].decoder
+            if decoder is None:
+                # Actions are not reported back
+                continue
+            future = self._hass.loop.create_future()
+            self._write_acks.setdefault(reg_id, []).append((decoder(raw), future))
+            acks.append((reg_id, future))
+
+        _LOGGER.debug("MQTT topic: %s, payload: %s", topic, payload)
+        confirmed = False
+        try:
+            start = time.monotonic()
+            await self._async_publish(topic, payload)
+            self._stats["writes_published"] += 1
+
+            if acks:
+                async with asyncio.timeout(self._write_timeout):
+                    await asyncio.gather(*(future for _, future in acks))
+                self._record_write_latency(time.monotonic() - start)
+            confirmed = True
+        except TimeoutError:
+            self._stats["writes_timed_out"] += 1
+            _LOGGER.warning(
+                "Heat pump did not confirm %s within %s s", payload, self._write_timeout
+            )
+        except Exception:
+            _LOGGER.exception("Failed sending registers: %s", payload)
+        finally:
+            for reg_id, future in acks:
+                future.cancel()
+                waiters = self._write_acks[reg_id]
+                waiters[:] = [waiter for waiter in waiters if waiter[1] is not future]
+                if not waiters:
+                    del self._write_acks[reg_id]
+            self.async_refresh_entities()
+            if not done.done():
+                done.set_result(confirmed)
+
+    def _record_write_latency(self, latency: float) -> None:
+        """Update write-to-confirm latency stats."""
+        stats = self._stats
+        latency_ms = round(latency * 1000)
+        stats["writes_confirmed"] += 1
+        stats["write_latency_last_ms"] = latency_ms
+        stats["write_latency_max_ms"] = max(stats["write_latency_max_ms"], latency_ms)
+        # Running mean over all confirmed writes
+        stats["write_latency_avg_ms"] += round(
+            (latency_ms - stats["write_latency_avg_ms"]) / stats["writes_confirmed"]
+        )
 
     async def mqtt_keep_alive(self) -> None:
         """Send keep-alive message to heat pump."""
-        if time.time() - self._keep_alive_delay < _KEEP_ALIVE_INTERVAL:
-            return
+        self._send_keep_alive()
 
-        self._keep_alive_delay = time.time()
-        query_list = (
-            [int(cap) for cap in self._capabilities] if self._capabilities else []
+    @callback
+    def _send_keep_alive(self) -> None:
+        """Send FORCE_RESPONSE query, opening a session if needed."""
+        now = time.monotonic()
+        keepalive = self._keepalive
+        last_seen = keepalive.last_seen
+        if last_seen is None or now - last_seen >= keepalive.silence_limit:
+            # Device stopped reporting, the session has lapsed
+            self._session.expire()
+        answered = (
+            last_seen is not None
+            and keepalive.last_query is not None
+            and last_seen > keepalive.last_query
         )
 
-        payload = json.dumps(
-            {
-                "FORCE_RESPONSE": True,
-                "values": {"5074": "0255", "5106": "0000", "5109": "0000"},
-                "query_list": query_list,
-            }
+        opening = not self._session.is_open
+        if self._all_consumed:
+            capabilities = self._capabilities
+        else:
+            capabilities = [cap for cap in self._capabilities if cap in self._listeners]
+        query_list = self._planner.next_query(capabilities)
+        if not self._discovery.complete:
+            # Probe registers not confirmed yet, unanswered ones get dropped
+            self._discovery.probed(answered)
+            query_list += [int(reg_id) for reg_id in self._discovery.candidates]
+        message = self._session.build_query(query_list, now)
+        keepalive.query_sent(now)
+        stats = self._stats
+        stats["keep_alives_sent"] += 1
+        stats["session_opens" if opening else "read_queries"] += 1
+
+        payload = json.dumps(message)
+
+        _LOGGER.debug(
+            "Sending keep-alive message to heat pump (%s)",
+            "session open" if opening else "read",
         )
 
-        _LOGGER.debug("Sending keep-alive message to heat pump")
+        self._hass.async_create_task(self._async_publish(self._cmd_topic, payload))
 
-        self._hass.async_create_task(
-            mqtt.async_publish(
-                self._hass, self._cmd_topic, payload, qos=2, retain=False
-            )
+    async def _async_publish(self, topic: str, payload: str) -> None:
+        """Publish a message and record the time until the broker took it."""
+        start = time.monotonic()
+        await mqtt.async_publish(self._hass, topic, payload, qos=2, retain=False)
+        latency_ms = round((time.monotonic() - start) * 1000)
+        stats = self._stats
+        stats["publishes_sent"] += 1
+        stats["publish_latency_max_ms"] = max(
+            stats["publish_latency_max_ms"], latency_ms
         )
+        # Running mean over all publishes
+        stats["publish_latency_avg_ms"] += round(
+            (latency_ms - stats["publish_latency_avg_ms"]) / stats["publishes_sent"]
+        )
+
+    @callback
+    def async_request_registers(self, reg_ids) -> None:
+        """Query registers soon, whatever their polling tier."""
+        self._planner.request(reg_ids)
+        if self._watchdog_unsub is not None:
+            # Collect requests for a moment, then query once
+            self._watchdog_unsub()
+            self._keep_alive_at = time.monotonic() + _REQUEST_DELAY
+            self._watchdog_unsub = self._timers.call_at(
+                self._keep_alive_at, self._keep_alive_due
+            )
+
+    @callback
+    def async_requery(self) -> None:
+        """Query all registers, e.g. after the MQTT connection was lost."""
+        if self._unsub_data is None:
+            return
+        self._planner.request(self._capabilities)
+        self._gate.submit(self._id, self._query)
 
     async def watchdog(self) -> None:
-        """Monitor MQTT connection and trigger keep-alive when needed."""
+        """Query the device, then schedule keep-alives from its cadence."""
+        self._gate.submit(self._id, self._query)
 
-        @callback
-        def _check(now) -> None:
-            """Check if keep-alive is needed."""
-            if time.time() - self._last_time >= _WATCHDOG_TIMEOUT:
-                _LOGGER.debug("No MQTT message for 5 minutes, triggering keep-alive")
-                self._hass.async_create_task(self.mqtt_keep_alive())
-
-        self._watchdog_unsub = async_track_time_interval(
-            self._hass, _check, _WATCHDOG_CHECK_INTERVAL
+    @callback
+    def _schedule_keep_alive(self) -> None:
+        """Wake up when the next keep-alive may be due."""
+        if self._watchdog_unsub is not None:
+            self._watchdog_unsub()
+        keepalive = self._keepalive
+        self._keep_alive_at = keepalive.next_query()
+        # Jitter keeps the heat pumps of a fleet from querying in lockstep
+        jitter = _KEEP_ALIVE_JITTER * min(
+            keepalive.refresh_interval, keepalive.silence_limit
+        )
+        self._watchdog_unsub = self._timers.call_at(
+            self._keep_alive_at + random.uniform(0, jitter), self._keep_alive_due
         )
+
+    @property
+    def _timers(self) -> DeadlineScheduler:
+        """Return deadline scheduler shared with the other heat pumps."""
+        return self._hass.data[DOMAIN].scheduler
+
+    @property
+    def _gate(self) -> QueryGate:
+        """Return query gate shared with the other heat pumps."""
+        return self._hass.data[DOMAIN].query_gate
+
+    @callback
+    def _keep_alive_due(self) -> None:
+        """Send keep-alive if the device is overdue or a refresh is due."""
+        # Reports that arrived since scheduling may have moved the deadline
+        if self._planner.pending or self._keepalive.next_query() <= time.monotonic():
+            _LOGGER.debug("Keep-alive due: %s", self._keepalive)
+            # Scheduled again once the gate let the query through
+            self._keep_alive_at = None
+            self._gate.submit(self._id, self._query)
+        else:
+            self._schedule_keep_alive()
+
+    @callback
+    def _query(self) -> None:
+        """Send keep-alive and schedule the next one."""
+        self._send_keep_alive()
+        self._schedule_keep_alive()
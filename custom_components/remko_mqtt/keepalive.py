@@ -0,0 +1,211 @@
+"""Keep-alive scheduling from the observed reporting cadence of a heat pump.
+
+Also selects the registers of each query by polling tier.
+"""
+
+
+class KeepAliveScheduler:
+    """Decide when the next FORCE_RESPONSE query is due.
+
+    The report interval is learned as an exponentially weighted moving
+    average.  A query is due when the device is overdue, i.e. silent for
+    several report intervals, or when the refresh interval has passed.
+    The refresh interval doubles up to max_interval while traffic is
+    healthy and for unanswered queries, and is reset once an overdue
+    device answers again.  All times are monotonic seconds.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 30.0,
+        max_interval: float = 300.0,
+        grace: float = 3.0,
+        min_silence: float = 5.0,
+        alpha: float = 0.2,
+    ) -> None:
+        """Initialize scheduler, the first query is due immediately."""
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.grace = grace
+        self.min_silence = min_silence
+        self.alpha = alpha
+
+        self.report_interval: float | None = None
+        self.refresh_interval = min_interval
+        self.last_seen: float | None = None
+        self.last_query: float | None = None
+
+    def __repr__(self) -> str:
+        return (
+            f"KeepAliveScheduler(report interval {self.report_interval}s, "
+            f"refresh interval {self.refresh_interval}s)"
+        )
+
+    @property
+    def silence_limit(self) -> float:
+        """Return seconds without a report after which the device is overdue."""
+        if self.report_interval is None:
+            return self.min_interval
+        return min(
+            max(self.grace * self.report_interval, self.min_silence),
+            self.max_interval,
+        )
+
+    def observe(self, now: float) -> None:
+        """Record a report from the device."""
+        if self.last_seen is not None:
+            interval = now - self.last_seen
+            # Long outages are not part of the reporting cadence
+            if interval <= self.max_interval:
+                if self.report_interval is None:
+                    self.report_interval = interval
+                else:
+                    self.report_interval += self.alpha * (
+                        interval - self.report_interval
+                    )
+        self.last_seen = now
+
+    def defer(self, now: float) -> None:
+        """Postpone the next refresh, e.g. while another client is active."""
+        self.last_query = now
+
+    def next_query(self) -> float:
+        """Return time when the next query is due."""
+        if self.last_query is None:
+            return float("-inf")
+        refresh = self.last_query + self.refresh_interval
+        if self.last_seen is None or self.last_seen <= self.last_query:
+            # Already asked since the last report
+            return refresh
+        return min(refresh, self.last_seen + self.silence_limit)
+
+    def query_sent(self, now: float) -> None:
+        """Record a query and adjust the refresh interval."""
+        if self.last_query is not None:
+            healthy = (
+                self.last_seen is not None and now - self.last_seen < self.silence_limit
+            )
+            answered = self.last_seen is not None and self.last_seen > self.last_query
+            if healthy or not answered:
+                # Back off while traffic is fine or the device does not answer
+                self.refresh_interval = min(
+                    self.refresh_interval * 2, self.max_interval
+                )
+            else:
+                self.refresh_interval = self.min_interval
+        self.last_query = now
+
+
+# Polling tiers and the default number of keep-alive cycles between queries
+QUERY_TIERS = {"fast": 1, "normal": 2, "slow": 10}
+
+
+def parse_query_tiers(text: str) -> tuple[dict[str, int], dict[str, str]]:
+    """Parse polling tier settings.
+
+    Format: "tier=cycles" or "reg_name=tier" entries separated by commas or
+    new lines, e.g. "slow=20, energy_electric=fast".  Returns the cycles by
+    tier and the tier by register name.  Raises ValueError on invalid input.
+    """
+    cycles = {}
+    tiers = {}
+    for item in text.replace("\n", ",").split(","):
+        item = item.strip()
+        if not item:
+            continue
+
+        name, sep, setting = (part.strip() for part in item.partition("="))
+        if not sep or not name or not setting:
+            raise ValueError(f"Invalid query tier: {item}")
+
+        if name in QUERY_TIERS:
+            if not setting.isdigit() or int(setting) < 1:
+                raise ValueError(f"Invalid number of cycles: {item}")
+            cycles[name] = int(setting)
+        elif setting in QUERY_TIERS:
+            tiers[name] = setting
+        else:
+            raise ValueError(f"Unknown query tier: {item}")
+
+    return cycles, tiers
+
+
+class QueryPlanner:
+    """Select the registers of each keep-alive query by polling tier."""
+
+    def __init__(self) -> None:
+        """Initialize planner with the default tier cycles."""
+        self._cycle = 0
+        self._cycles = dict(QUERY_TIERS)
+        self._tiers: dict[str, str] = {}
+        self._requested: set[str] = set()
+
+    def configure(self, tiers: dict[str, str], cycles: dict[str, int]) -> None:
+        """Set tier by register id and cycles by tier.
+
+        The next query asks for all registers.
+        """
+        self._tiers = tiers
+        self._cycles = {**QUERY_TIERS, **cycles}
+        self._cycle = 0
+
+    def request(self, reg_ids) -> None:
+        """Ask for registers with the next query, whatever their tier."""
+        self._requested.update(reg_ids)
+
+    @property
+    def pending(self) -> bool:
+        """Return True if registers were requested on demand."""
+        return bool(self._requested)
+
+    def next_query(self, reg_ids) -> list[int]:
+        """Return query list of the next cycle out of reg_ids."""
+        cycle = self._cycle
+        self._cycle += 1
+        requested = self._requested
+        query_list = [
+            int(reg_id)
+            for reg_id in reg_ids
+            if reg_id in requested
+            or cycle % self._cycles[self._tiers.get(reg_id, "fast")] == 0
+        ]
+        self._requested = set()
+        return query_list
+
+
+# Control values that open a reporting session on the device
+SESSION_VALUES = {"5074": "0255", "5106": "0000", "5109": "0000"}
+
+
+class SessionTracker:
+    """Track whether the device has an open reporting session.
+
+    The control values are only written to open a session.  A session
+    counts as expired once the device is overdue, after a foreign client
+    talked to it and after resubscribing.
+    """
+
+    def __init__(self) -> None:
+        """Initialize tracker without a session."""
+        self.is_open = False
+        self.opened_at: float | None = None
+
+    def __repr__(self) -> str:
+        state = f"open since {self.opened_at}" if self.is_open else "closed"
+        return f"SessionTracker({state})"
+
+    def expire(self) -> None:
+        """Mark session as expired, the next query opens a new one."""
+        self.is_open = False
+
+    def build_query(self, query_list: list[int], now: float) -> dict:
+        """Return keep-alive message, opening a session if needed."""
+        if self.is_open:
+            return {"FORCE_RESPONSE": True, "query_list": query_list}
+        self.is_open = True
+        self.opened_at = now
+        return {
+            "FORCE_RESPONSE": True,
+            "values": dict(SESSION_VALUES),
+            "query_list": query_list,
+        }
@@ -9,26 +9,17 @@ from homeassistant.const import UnitOfTemperature
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity_registry import RegistryEntryDisabler
 
 from .const import DOMAIN, CONF_ID, CONF_NAME, CONF_VER
-from .remko_regs import (
-    FIELD_REGID,
-    FIELD_REGTYPE,
-    FIELD_UNIT,
-    FIELD_MINVALUE,
-    FIELD_MAXVALUE,
-    FIELD_ACTIVE,
-    remko_reg_translation,
-    remko_reg,
-)
+from .registry import BY_PLATFORM
 
 _LOGGER = logging.getLogger(__name__)
 
 # Constants
-_NUMBER_TYPES = {"sensor_temp_inp"}
 _TEMPERATURE_TYPES = {"sensor_temp", "sensor_temp_inp"}
 _TEMPERATURE_UNITS = {"C", "°C"}
 _DEFAULT_STEP = 0.5
@@ -49,47 +40,50 @@ async def async_setup_entry(
     during initialization of a new integration.
     """
     heatpump = hass.data[DOMAIN]._heatpumps[config_entry.data[CONF_ID]]
-    entities: list[NumberEntity] = []
-
-    for reg_name, reg_data in remko_reg.items():
-        reg_type = reg_data[FIELD_REGTYPE]
-        reg_id = reg_data[FIELD_REGID]
-        active = (
-            reg_data[FIELD_ACTIVE] != False
-        )  # Default to True if FIELD_ACTIVE not present
-
-        # Only create number entities for sensor_temp_inp type that are available
-        if reg_type not in _NUMBER_TYPES or reg_id not in heatpump._capabilities:
-            continue
-
-        # Get friendly name from translation
-        friendly_name = None
-        if reg_name in remko_reg_translation:
-            try:
-                friendly_name = remko_reg_translation[reg_name][heatpump._langid]
-            except (IndexError, KeyError):
+
+    @callback
+    def _async_add_registers(specs) -> None:
+        """Create entities for registers confirmed on the heat pump."""
+        entities: list[NumberEntity] = []
+        for spec in specs:
+            if spec.platform != "number":
+                continue
+
+            friendly_name = spec.friendly_name(heatpump._langid)
+            if friendly_name is None:
                 _LOGGER.warning(
                     "Could not get translation for %s at language index %s",
-                    reg_name,
+                    spec.name,
                     heatpump._langid,
                 )
 
-        entities.append(
-            HeatPumpNumber(
-                hass=hass,
-                heatpump=heatpump,
-                reg_name=reg_name,
-                reg_id=reg_id,
-                active=active,
-                reg_type=reg_type,
-                reg_unit=reg_data[FIELD_UNIT],
-                reg_min=reg_data[FIELD_MINVALUE],
-                reg_max=reg_data[FIELD_MAXVALUE],
-                friendly_name=friendly_name,
+            entities.append(
+                HeatPumpNumber(
+                    hass=hass,
+                    heatpump=heatpump,
+                    reg_name=spec.name,
+                    reg_id=spec.key,
+                    active=spec.active,
+                    reg_type=spec.reg_type,
+                    reg_unit=spec.unit,
+                    reg_min=spec.min_value,
+                    reg_max=spec.max_value,
+                    friendly_name=friendly_name,
+                )
             )
-        )
 
-    async_add_entities(entities)
+        if entities:
+            async_add_entities(entities)
+
+    # Registers confirmed so far, the others are added once discovered
+    _async_add_registers(
+        [spec for spec in BY_PLATFORM["number"] if spec.key in heatpump._capabilities]
+    )
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, heatpump.new_registers_signal, _async_add_registers
+        )
+    )
 
 
 class HeatPumpNumber(NumberEntity):
@@ -97,6 +91,7 @@ class HeatPumpNumber(NumberEntity):
 
     _attr_has_entity_name = True
     _attr_available = True
+    _attr_should_poll = False
     _attr_mode = NumberMode.BOX
 
     def __init__(
@@ -179,16 +174,21 @@ class HeatPumpNumber(NumberEntity):
     async def async_added_to_hass(self) -> None:
         """Register MQTT event listener when entity is added to Home Assistant."""
 
-        @callback
-        def _handle_mqtt_event(event) -> None:
-            """Handle MQTT message received event."""
-            self.hass.async_create_task(self._async_update_from_event(event))
+        self.async_on_remove(
+            self._heatpump.async_add_listener(self._reg_id, self._handle_update)
+        )
 
-        mqtt_event = f"{self._heatpump._domain}_{self._heatpump._id}_msg_rec_event"
-        listener = self.hass.bus.async_listen(mqtt_event, _handle_mqtt_event)
-        self.async_on_remove(listener)
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, self._heatpump.refresh_signal, self._handle_update
+            )
+        )
         _LOGGER.debug("MQTT event listener registered for %s", self.entity_id)
 
+        # Start from the last known value, e.g. restored from the previous run
+        if self._heatpump.has_value(self._reg_id):
+            self._handle_update()
+
         # Disable entity if active=False
         if not self._active:
             await self._disable_entity(self.hass, self.entity_id, True)
@@ -207,9 +207,10 @@ class HeatPumpNumber(NumberEntity):
         self._attr_available = True
         self._attr_native_value = value
 
-    async def _async_update_from_event(self, event) -> None:
-        """Handle MQTT event and update state if changed."""
-        _LOGGER.debug("MQTT event received for %s", self._reg_name)
+    @callback
+    def _handle_update(self) -> None:
+        """Update state from heat pump data if changed."""
+        _LOGGER.debug("MQTT update received for %s", self._reg_name)
         value = self._heatpump.get_value(self._reg_id)
 
         if value is None:
@@ -232,15 +233,6 @@ class HeatPumpNumber(NumberEntity):
             _LOGGER.debug("Value unchanged for %s, skipping send", self._reg_name)
             return
 
-        # Update local cache
-        self._heatpump._hpstate[self._reg_id] = value
-
-        # Send to heat pump
-        await self._heatpump.send_mqtt_reg(self._reg_name, value)
-
-        # Notify other entities
-        self._heatpump._hass.bus.fire(
-            f"{self._heatpump._domain}_{self._heatpump._id}_msg_rec_event", {}
-        )
-
-        _LOGGER.info("Value sent for %s: %s", self._reg_name, value)
+        # Shown right away, rolled back if the device does not confirm it
+        if await self._heatpump.async_write_register(self._reg_name, value):
+            _LOGGER.info("Value sent for %s: %s", self._reg_name, value)
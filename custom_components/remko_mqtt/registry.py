@@ -0,0 +1,217 @@
+"""Register registry, compiled once from the remko_regs definitions."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any
+
+from .const import AVAILABLE_LANGUAGES
+from .remko_regs import (
+    FIELD_REGID,
+    FIELD_REGTYPE,
+    FIELD_UNIT,
+    FIELD_MINVALUE,
+    FIELD_MAXVALUE,
+    FIELD_ACTIVE,
+    remko_reg,
+    remko_reg_options,
+    remko_reg_translation,
+)
+from .timeprogram_converter import RemkoTimeProgramConverter
+
+# Entity platform by register type
+_PLATFORM_BY_TYPE = {
+    "sensor": "sensor",
+    "sensor_counter": "sensor",
+    "sensor_el": "sensor",
+    "sensor_en": "sensor",
+    "sensor_input": "sensor",
+    "sensor_mode": "sensor",
+    "sensor_temp": "sensor",
+    "timeprogram": "sensor",
+    "sensor_temp_inp": "number",
+    "switch": "switch",
+    "select_input": "select",
+    "binary_sensor": "binary_sensor",
+    "action": "button",
+}
+
+# Polling tier by register type, all others are "fast"
+_TIER_BY_TYPE = {
+    "sensor_temp_inp": "normal",
+    "switch": "normal",
+    "select_input": "normal",
+    "timeprogram": "slow",
+    "sensor_en": "slow",
+    "sensor_counter": "slow",
+}
+
+
+def _decode_switch(value: str) -> bool:
+    return int(value, 16) > 0
+
+
+def _decode_power(value: str) -> int:
+    return int(value, 16) * 100
+
+
+def _decode_int(value: str) -> int:
+    return int(value, 16)
+
+
+def _decode_temp(value: str) -> float:
+    raw = int(value, 16)
+    return (-(raw & 0x8000) | (raw & 0x7FFF)) / 10
+
+
+# Stateless decoders by register type
+_DECODERS: dict[str, Callable[[str], Any]] = {
+    "switch": _decode_switch,
+    "binary_sensor": _decode_switch,
+    "timeprogram": RemkoTimeProgramConverter.hex_to_mask,
+    "sensor_el": _decode_power,
+    "sensor_en": _decode_int,
+    "sensor_counter": _decode_int,
+    "sensor_temp": _decode_temp,
+    "sensor_temp_inp": _decode_temp,
+    "sensor_mode": _decode_int,
+    "select_input": _decode_int,
+}
+
+
+def _encode_raw(value: Any) -> Any:
+    return value
+
+
+def _encode_temp(value: float) -> str:
+    # Two's complement, so negative offsets are sent correctly
+    return f"{round(value * 10) & 0xFFFF:04X}"
+
+
+def _encode_code(value: int) -> str:
+    return str(int(value)).zfill(2)
+
+
+def _encode_switch(value: Any) -> str:
+    return f"{int(value):02x}"
+
+
+# Encoders of outgoing values by register type
+_ENCODERS: dict[str, Callable[[Any], Any]] = {
+    "sensor_temp_inp": _encode_temp,
+    "select_input": _encode_code,
+    "switch": _encode_switch,
+    "action": _encode_switch,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class RegisterSpec:
+    """Immutable description of a heat pump register."""
+
+    name: str
+    key: str  # register id as used in MQTT payloads and the state
+    id: int
+    reg_type: str
+    platform: str | None
+    unit: str
+    min_value: float | None
+    max_value: float | None
+    active: bool
+    tier: str
+    # Friendly names by language index, None if untranslated
+    names: tuple[str | None, ...]
+    decoder: Callable[[str], Any] | None
+    encoder: Callable[[Any], Any]
+    # Option registers only: first code, labels and label -> code by language
+    first_code: int = 0
+    options: tuple[tuple[str, ...], ...] | None = None
+    codes: tuple[MappingProxyType, ...] | None = None
+
+    def friendly_name(self, langid: int) -> str | None:
+        """Return friendly name in the given language."""
+        return self.names[langid]
+
+    def label(self, code: Any, langid: int) -> str | None:
+        """Return translated label of an option code."""
+        if self.options is None or not isinstance(code, int):
+            return None
+        labels = self.options[langid]
+        index = code - self.first_code
+        return labels[index] if 0 <= index < len(labels) else None
+
+    def code(self, label: str, langid: int) -> int | None:
+        """Return option code of a translated label."""
+        return self.codes[langid].get(label) if self.codes is not None else None
+
+
+def _limit(value: Any) -> float | None:
+    return None if value == "" else value
+
+
+def _compile(reg_name: str, reg_data: list) -> RegisterSpec:
+    """Compile one remko_reg entry."""
+    reg_type = reg_data[FIELD_REGTYPE]
+    translation = remko_reg_translation.get(reg_name, ())
+    names = tuple(
+        translation[langid] if langid < len(translation) else None
+        for langid in range(len(AVAILABLE_LANGUAGES))
+    )
+
+    first_code = 0
+    options = codes = None
+    if reg_name in remko_reg_options:
+        prefix, first_code, count = remko_reg_options[reg_name]
+        options = tuple(
+            tuple(
+                remko_reg_translation[f"{prefix}{code}"][langid]
+                for code in range(first_code, first_code + count)
+            )
+            for langid in range(len(AVAILABLE_LANGUAGES))
+        )
+        codes = tuple(
+            MappingProxyType(
+                {label: code for code, label in enumerate(labels, first_code)}
+            )
+            for labels in options
+        )
+
+    return RegisterSpec(
+        name=reg_name,
+        key=reg_data[FIELD_REGID],
+        id=int(reg_data[FIELD_REGID]),
+        reg_type=reg_type,
+        platform=_PLATFORM_BY_TYPE.get(reg_type),
+        unit=reg_data[FIELD_UNIT],
+        min_value=_limit(reg_data[FIELD_MINVALUE]),
+        max_value=_limit(reg_data[FIELD_MAXVALUE]),
+        # Default to True if FIELD_ACTIVE not present
+        active=reg_data[FIELD_ACTIVE] is not False,
+        tier=_TIER_BY_TYPE.get(reg_type, "fast"),
+        names=names,
+        decoder=_DECODERS.get(reg_type),
+        encoder=_ENCODERS.get(reg_type, _encode_raw),
+        first_code=first_code,
+        options=options,
+        codes=codes,
+    )
+
+
+# All registers in definition order
+REGISTERS: tuple[RegisterSpec, ...] = tuple(
+    _compile(reg_name, reg_data) for reg_name, reg_data in remko_reg.items()
+)
+
+# Indexes, shared by all heat pumps
+BY_KEY: MappingProxyType[str, RegisterSpec] = MappingProxyType(
+    {spec.key: spec for spec in REGISTERS}
+)
+BY_NAME: MappingProxyType[str, RegisterSpec] = MappingProxyType(
+    {spec.name: spec for spec in REGISTERS}
+)
+BY_PLATFORM: MappingProxyType[str, tuple[RegisterSpec, ...]] = MappingProxyType(
+    {
+        platform: tuple(spec for spec in REGISTERS if spec.platform == platform)
+        for platform in set(_PLATFORM_BY_TYPE.values())
+    }
+)
@@ -48,6 +48,16 @@ remko_reg = {
     "compressor_starts": ["5822", "sensor_counter", "", 0, 65535, False],
 }
 
+# Option registers
+#  reg_name: ['translation prefix', first code, number of codes]
+remko_reg_options = {
+    "opmode": ["opmode", 1, 16],
+    "main_mode": ["mode", 1, 4],
+    "dhw_opmode": ["dhwopmode", 0, 4],
+    "timemode": ["timemode", 0, 2],
+    "user_profile": ["user_profile", 0, 3],
+}
+
 # Translation dictionary
 #  ['en', 'de']
 remko_reg_translation = {
@@ -117,4 +127,14 @@ remko_reg_translation = {
     "user_profile0": ["Profile A", "Profil A"],
     "user_profile1": ["Profile B", "Profil B"],
     "user_profile2": ["Profile C", "Profil C"],
+    "diagnostic_messages_per_minute": ["Messages per minute", "Nachrichten pro Minute"],
+    "diagnostic_bytes_received": ["Bytes received", "Empfangene Bytes"],
+    "diagnostic_json_parse_time": ["JSON parse time", "JSON-Parse-Zeit"],
+    "diagnostic_decode_time": ["Decode time", "Dekodierzeit"],
+    "diagnostic_registers_changed": ["Registers changed", "Geänderte Register"],
+    "diagnostic_registers_unchanged": ["Registers unchanged", "Unveränderte Register"],
+    "diagnostic_registers_throttled": ["Registers throttled", "Gedrosselte Register"],
+    "diagnostic_publishes_sent": ["Publishes sent", "Gesendete Nachrichten"],
+    "diagnostic_publish_latency": ["Publish latency", "Sendelatenz"],
+    "diagnostic_last_message_age": ["Last message age", "Alter der letzten Nachricht"],
 }
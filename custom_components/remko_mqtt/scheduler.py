@@ -0,0 +1,271 @@
+"""Deadline scheduler shared by all heat pumps of a worker."""
+
+import heapq
+import itertools
+import time
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+
+class DeadlineScheduler:
+    """Run callbacks at monotonic deadlines with a single timer.
+
+    Deadlines are kept in a heap and the timer is only armed for the
+    earliest one, so the event loop holds one timer however many heat pumps
+    are waiting.  Cancelled deadlines stay in the heap until they come up.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize scheduler without deadlines."""
+        self._hass = hass
+        # [deadline, sequence, action], action is None once cancelled
+        self._heap: list[list] = []
+        self._sequence = itertools.count()
+        self._pending = 0
+        self._timer_at: float | None = None
+        self._timer_unsub: Callable[[], None] | None = None
+        self._waking = False
+        self._stats = {"scheduled": 0, "cancelled": 0, "wakeups": 0}
+
+    def __repr__(self) -> str:
+        return f"DeadlineScheduler({self._pending} pending, next {self._timer_at})"
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return scheduling counters."""
+        return dict(self._stats, pending=self._pending)
+
+    @callback
+    def call_at(
+        self, deadline: float, action: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Run action at the monotonic deadline.  Returns a cancel function."""
+        entry = [deadline, next(self._sequence), action]
+        heapq.heappush(self._heap, entry)
+        self._pending += 1
+        self._stats["scheduled"] += 1
+        if not self._waking and (self._timer_at is None or deadline < self._timer_at):
+            self._arm(deadline)
+
+        @callback
+        def cancel() -> None:
+            if entry[2] is None:
+                return
+            entry[2] = None
+            self._pending -= 1
+            self._stats["cancelled"] += 1
+            if not self._pending:
+                self._disarm()
+                self._heap.clear()
+
+        return cancel
+
+    @callback
+    def call_later(
+        self, delay: float, action: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Run action after delay seconds.  Returns a cancel function."""
+        return self.call_at(time.monotonic() + delay, action)
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel all deadlines and the timer."""
+        for entry in self._heap:
+            # Makes the cancel functions handed out no-ops
+            entry[2] = None
+        self._heap.clear()
+        self._pending = 0
+        self._disarm()
+
+    @callback
+    def _arm(self, deadline: float) -> None:
+        """Arm the timer for the earliest deadline."""
+        self._disarm()
+        self._timer_at = deadline
+        self._timer_unsub = async_call_later(
+            self._hass, max(deadline - time.monotonic(), 0), self._wake
+        )
+
+    @callback
+    def _disarm(self) -> None:
+        if self._timer_unsub is not None:
+            self._timer_unsub()
+        self._timer_unsub = None
+        self._timer_at = None
+
+    @callback
+    def _wake(self, _now=None) -> None:
+        """Run all due actions and arm the timer for the next deadline."""
+        self._timer_unsub = None
+        self._timer_at = None
+        self._stats["wakeups"] += 1
+        heap = self._heap
+        now = time.monotonic()
+        # Actions usually schedule again, arm the timer once afterwards
+        self._waking = True
+        try:
+            while heap and heap[0][0] <= now:
+                entry = heapq.heappop(heap)
+                action = entry[2]
+                if action is None:
+                    continue
+                entry[2] = None
+                self._pending -= 1
+                action()
+        finally:
+            self._waking = False
+
+        # Skip cancelled deadlines at the top
+        while heap and heap[0][2] is None:
+            heapq.heappop(heap)
+        if heap:
+            self._arm(heap[0][0])
+
+
+class QueryGate:
+    """Limit the keep-alive queries of all heat pumps awaiting an answer.
+
+    A query is in flight from its publish until the heat pump reports or
+    the timeout passes.  Queries beyond max_in_flight wait in submission
+    order, at most one per heat pump.
+    """
+
+    def __init__(
+        self,
+        scheduler: DeadlineScheduler,
+        max_in_flight: int = 8,
+        timeout: float = 10.0,
+    ) -> None:
+        """Initialize gate without queries."""
+        self._scheduler = scheduler
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        # Key -> cancel function of the timeout
+        self._in_flight: dict[str, Callable[[], None]] = {}
+        # Key -> send function, in submission order
+        self._waiting: dict[str, Callable[[], None]] = {}
+        self._stats = {"queries": 0, "queued": 0, "timeouts": 0, "max_in_flight": 0}
+        # Burst of queries whose send times are recorded, and the last one
+        self._burst: dict[str, Any] | None = None
+        self._last_burst: dict[str, Any] | None = None
+
+    def __repr__(self) -> str:
+        return (
+            f"QueryGate({len(self._in_flight)} in flight, "
+            f"{len(self._waiting)} waiting)"
+        )
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return query counters."""
+        return dict(
+            self._stats, in_flight=len(self._in_flight), waiting=len(self._waiting)
+        )
+
+    @property
+    def burst(self) -> dict[str, Any] | None:
+        """Return how the queries of the current or last burst were spread.
+
+        Offsets are seconds from the trigger to the first and last query
+        actually sent, the spread is the time between those two.
+        """
+        burst = self._burst or self._last_burst
+        if burst is None:
+            return None
+        sent = burst["sent"]
+        return {
+            "trigger": burst["trigger"],
+            "complete": not burst["pending"],
+            "queries": len(sent),
+            "first_s": round(sent[0], 1) if sent else None,
+            "last_s": round(sent[-1], 1) if sent else None,
+            "spread_s": round(sent[-1] - sent[0], 1) if sent else None,
+            "peak_in_flight": burst["peak_in_flight"],
+        }
+
+    @callback
+    def track_burst(self, trigger: str, keys) -> None:
+        """Record when the next queries of keys are sent.
+
+        Keys join an open burst of the same trigger, any other open burst
+        is closed as it stands.
+        """
+        burst = self._burst
+        if burst is None or burst["trigger"] != trigger:
+            if burst is not None:
+                self._close_burst()
+            burst = self._burst = {
+                "trigger": trigger,
+                "start": time.monotonic(),
+                "pending": set(),
+                "sent": [],
+                "peak_in_flight": len(self._in_flight),
+            }
+        burst["pending"].update(keys)
+
+    @callback
+    def submit(self, key: str, send: Callable[[], None]) -> None:
+        """Send a query now, or once a slot is free."""
+        if key in self._in_flight or len(self._in_flight) >= self.max_in_flight:
+            if key not in self._waiting:
+                self._stats["queued"] += 1
+            self._waiting[key] = send
+            return
+        self._send(key, send)
+
+    @callback
+    def answered(self, key: str) -> None:
+        """Release the slot of an answered query."""
+        cancel = self._in_flight.get(key)
+        if cancel is not None:
+            cancel()
+            self._release(key)
+
+    @callback
+    def remove(self, key: str) -> None:
+        """Forget queries of a heat pump."""
+        self._waiting.pop(key, None)
+        self.answered(key)
+        burst = self._burst
+        if burst is not None and key in burst["pending"]:
+            burst["pending"].discard(key)
+            if not burst["pending"]:
+                self._close_burst()
+
+    @callback
+    def _send(self, key: str, send: Callable[[], None]) -> None:
+        self._in_flight[key] = self._scheduler.call_later(
+            self.timeout, lambda: self._release(key, timed_out=True)
+        )
+        stats = self._stats
+        stats["queries"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], len(self._in_flight))
+        burst = self._burst
+        if burst is not None:
+            burst["peak_in_flight"] = max(burst["peak_in_flight"], len(self._in_flight))
+            if key in burst["pending"]:
+                burst["pending"].discard(key)
+                burst["sent"].append(time.monotonic() - burst["start"])
+                if not burst["pending"]:
+                    self._close_burst()
+        send()
+
+    @callback
+    def _close_burst(self) -> None:
+        self._last_burst = self._burst
+        self._burst = None
+
+    @callback
+    def _release(self, key: str, timed_out: bool = False) -> None:
+        """Free a slot and send waiting queries."""
+        del self._in_flight[key]
+        if timed_out:
+            self._stats["timeouts"] += 1
+        for waiting in list(self._waiting):
+            if len(self._in_flight) >= self.max_in_flight:
+                break
+            if waiting not in self._in_flight:
+                self._send(waiting, self._waiting.pop(waiting))
@@ -8,33 +8,19 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity_registry import RegistryEntryDisabler
 
 from .const import DOMAIN, CONF_ID, CONF_NAME, CONF_VER
-from .remko_regs import (
-    FIELD_REGID,
-    FIELD_REGTYPE,
-    FIELD_ACTIVE,
-    remko_reg_translation,
-    remko_reg,
-)
+from .registry import BY_PLATFORM
 
 _LOGGER = logging.getLogger(__name__)
 
 # Constants
-_SELECT_TYPES = {"select_input"}
 _DEFAULT_ICON = "mdi:gauge"
 
-# Option ranges for each select register
-_OPTION_CONFIG = {
-    "main_mode": {"count": 4, "prefix": "mode", "start": 1},
-    "dhw_opmode": {"count": 4, "prefix": "dhwopmode", "start": 0},
-    "timemode": {"count": 2, "prefix": "timemode", "start": 0},
-    "user_profile": {"count": 3, "prefix": "user_profile", "start": 0},
-}
-
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -48,70 +34,46 @@ async def async_setup_entry(
     during initialization of a new integration.
     """
     heatpump = hass.data[DOMAIN]._heatpumps[config_entry.data[CONF_ID]]
-    entities: list[SelectEntity] = []
-
-    for reg_name, reg_data in remko_reg.items():
-        reg_type = reg_data[FIELD_REGTYPE]
-        reg_id = reg_data[FIELD_REGID]
-        active = (
-            reg_data[FIELD_ACTIVE] != False
-        )  # Default to True if FIELD_ACTIVE not present
-
-        # Only create select entities for select_input type that are available
-        if reg_type not in _SELECT_TYPES or reg_id not in heatpump._capabilities:
-            continue
-
-        # Get friendly name from translation
-        friendly_name = None
-        if reg_name in remko_reg_translation:
-            try:
-                friendly_name = remko_reg_translation[reg_name][heatpump._langid]
-            except (IndexError, KeyError):
+
+    @callback
+    def _async_add_registers(specs) -> None:
+        """Create entities for registers confirmed on the heat pump."""
+        entities: list[SelectEntity] = []
+        for spec in specs:
+            if spec.platform != "select":
+                continue
+
+            friendly_name = spec.friendly_name(heatpump._langid)
+            if friendly_name is None:
                 _LOGGER.warning(
                     "Could not get translation for %s at language index %s",
-                    reg_name,
+                    spec.name,
                     heatpump._langid,
                 )
 
-        # Get options for this select
-        options = _get_select_options(reg_name, heatpump._langid)
-
-        entities.append(
-            HeatPumpSelect(
-                hass=hass,
-                heatpump=heatpump,
-                reg_name=reg_name,
-                reg_id=reg_id,
-                active=active,
-                friendly_name=friendly_name,
-                options=options,
+            entities.append(
+                HeatPumpSelect(
+                    hass=hass,
+                    heatpump=heatpump,
+                    reg_name=spec.name,
+                    reg_id=spec.key,
+                    active=spec.active,
+                    friendly_name=friendly_name,
+                )
             )
-        )
-
-    async_add_entities(entities)
-
 
-def _get_select_options(reg_name: str, langid: int) -> list[str]:
-    """Get translated options for a select register."""
-    if reg_name not in _OPTION_CONFIG:
-        return []
+        if entities:
+            async_add_entities(entities)
 
-    config = _OPTION_CONFIG[reg_name]
-    options = []
-
-    for i in range(config["start"], config["start"] + config["count"]):
-        option_key = f"{config['prefix']}{i}"
-        try:
-            option_text = remko_reg_translation[option_key][langid]
-            options.append(option_text)
-        except (KeyError, IndexError):
-            _LOGGER.warning(
-                "Could not get translation for option %s at language index %s",
-                option_key,
-                langid,
-            )
-
-    return options
+    # Registers confirmed so far, the others are added once discovered
+    _async_add_registers(
+        [spec for spec in BY_PLATFORM["select"] if spec.key in heatpump._capabilities]
+    )
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, heatpump.new_registers_signal, _async_add_registers
+        )
+    )
 
 
 class HeatPumpSelect(SelectEntity):
@@ -119,6 +81,7 @@ class HeatPumpSelect(SelectEntity):
 
     _attr_has_entity_name = True
     _attr_available = True
+    _attr_should_poll = False
 
     def __init__(
         self,
@@ -128,7 +91,6 @@ class HeatPumpSelect(SelectEntity):
         reg_id: str,
         active: bool,
         friendly_name: str | None,
-        options: list[str],
     ) -> None:
         """Initialize select entity."""
         self.hass = hass
@@ -150,8 +112,8 @@ class HeatPumpSelect(SelectEntity):
         self._reg_name = reg_name
         self._reg_id = reg_id
 
-        # Options and state
-        self._attr_options = options
+        # Options and state, translated from the register code on update
+        self._attr_options = list(heatpump.get_options(reg_id))
         self._attr_current_option: str | None = None
 
         # Active flag
@@ -161,7 +123,7 @@ class HeatPumpSelect(SelectEntity):
             "Creating select entity %s for register %s with %d options",
             self._attr_unique_id,
             reg_name,
-            len(options),
+            len(self._attr_options),
         )
 
     @property
@@ -189,32 +151,46 @@ class HeatPumpSelect(SelectEntity):
     async def async_added_to_hass(self) -> None:
         """Register MQTT event listener when entity is added to Home Assistant."""
 
-        @callback
-        def _handle_mqtt_event(event) -> None:
-            """Handle MQTT message received event."""
-            self.hass.async_create_task(self._async_update_from_event(event))
+        self.async_on_remove(
+            self._heatpump.async_add_listener(self._reg_id, self._handle_update)
+        )
 
-        mqtt_event = f"{self._heatpump._domain}_{self._heatpump._id}_msg_rec_event"
-        listener = self.hass.bus.async_listen(mqtt_event, _handle_mqtt_event)
-        self.async_on_remove(listener)
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, self._heatpump.refresh_signal, self._handle_update
+            )
+        )
         _LOGGER.debug("MQTT event listener registered for %s", self.entity_id)
 
+        # Start from the last known value, e.g. restored from the previous run
+        if self._heatpump.has_value(self._reg_id):
+            self._handle_update()
+
         # Disable entity if active=False
         if not self._active:
             await self._disable_entity(self.hass, self.entity_id, True)
             _LOGGER.debug("Disabled entity %s (active=False)", self.entity_id)
 
-    async def _async_update_from_event(self, event) -> None:
-        """Handle MQTT event and update state if changed."""
-        _LOGGER.debug("MQTT event received for %s", self._reg_name)
+    @callback
+    def _handle_update(self) -> None:
+        """Update state from heat pump data if changed."""
+        _LOGGER.debug("MQTT update received for %s", self._reg_name)
+
+        # Options follow the configured language
+        options = self._heatpump.get_options(self._reg_id)
+        options_changed = len(options) != len(self._attr_options) or any(
+            a != b for a, b in zip(options, self._attr_options)
+        )
+        if options_changed:
+            self._attr_options = list(options)
 
-        value = self._heatpump.get_value(self._reg_id)
+        value = self._heatpump.get_label(self._reg_id)
 
         if value is None:
             _LOGGER.debug("Could not retrieve value for %s", self._reg_name)
             return
 
-        if self._attr_current_option != value:
+        if self._attr_current_option != value or options_changed:
             self._attr_current_option = value
             self.async_write_ha_state()
             _LOGGER.debug("State updated:   %s -> %s", self._reg_name, value)
@@ -223,10 +199,9 @@ class HeatPumpSelect(SelectEntity):
         """Select a new option and write it to the device via MQTT."""
         _LOGGER.debug("Selecting option for %s:  %s", self._reg_name, option)
 
-        # Get index of selected option
-        try:
-            option_index = self._attr_options.index(option)
-        except ValueError:
+        # Get code of selected option
+        option_code = self._heatpump.get_option_code(self._reg_id, option)
+        if option_code is None:
             _LOGGER.error(
                 "Option %s not valid for %s.  Valid options: %s",
                 option,
@@ -235,34 +210,16 @@ class HeatPumpSelect(SelectEntity):
             )
             return
 
-        # Get current option/index
-        current = self._heatpump._hpstate.get(self._reg_id)
-        current_index = None
-
-        if isinstance(current, str):
-            try:
-                current_index = self._attr_options.index(current)
-            except ValueError:
-                current_index = None
-        elif isinstance(current, int):
-            current_index = current
-
         # Skip if no change
-        if option_index == current_index:
+        if option_code == self._heatpump.get_value(self._reg_id):
             _LOGGER.debug("Option unchanged for %s, skipping send", self._reg_name)
             return
 
-        # Update local cache with option string
-        self._heatpump._hpstate[self._reg_id] = option
-
-        # Send option index to heat pump
-        await self._heatpump.send_mqtt_reg(self._reg_name, option_index)
-
-        # Notify other entities
-        self._heatpump._hass.bus.fire(
-            f"{self._heatpump._domain}_{self._heatpump._id}_msg_rec_event", {}
-        )
-
-        _LOGGER.info(
-            "Option sent for %s: %s (index:  %d)", self._reg_name, option, option_index
-        )
+        # Shown right away, rolled back if the device does not confirm it
+        if await self._heatpump.async_write_register(self._reg_name, option_code):
+            _LOGGER.info(
+                "Option sent for %s: %s (code:  %d)",
+                self._reg_name,
+                option,
+                option_code,
+            )
@@ -5,39 +5,28 @@ from typing import Any
 
 from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature
+from homeassistant.const import (
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTemperature,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity_registry import RegistryEntryDisabler
 
 from .const import DOMAIN, CONF_ID, CONF_NAME, CONF_VER
-from .remko_regs import (
-    FIELD_REGID,
-    FIELD_REGTYPE,
-    FIELD_UNIT,
-    FIELD_ACTIVE,
-    remko_reg_translation,
-    remko_reg,
-)
+from .registry import BY_PLATFORM
+from .remko_regs import remko_reg_translation
 from .timeprogram_converter import RemkoTimeProgramConverter
 
 _LOGGER = logging.getLogger(__name__)
 
 # Constants
-_SENSOR_TYPES = {
-    "sensor",
-    "sensor_counter",
-    "sensor_el",
-    "sensor_en",
-    "sensor_input",
-    "sensor_mode",
-    "sensor_temp",
-    "timeprogram",
-}
-
 _STATE_CLASS_MAPPING = {
     "sensor_counter": SensorStateClass.TOTAL_INCREASING,
     "sensor_en": SensorStateClass.TOTAL_INCREASING,
@@ -56,6 +45,26 @@ _UNIT_MAPPING = {
 
 _DEFAULT_ICON = "mdi:gauge"
 
+# Performance metrics: key -> (unit, state class, profiling), names are in
+# remko_reg_translation as diagnostic_<key>
+# Profiling sensors take parse and decode timings while enabled
+_DIAGNOSTIC_SENSORS = {
+    "messages_per_minute": ("msg/min", SensorStateClass.MEASUREMENT, False),
+    "bytes_received": (
+        UnitOfInformation.BYTES,
+        SensorStateClass.TOTAL_INCREASING,
+        False,
+    ),
+    "json_parse_time": (UnitOfTime.MICROSECONDS, SensorStateClass.MEASUREMENT, True),
+    "decode_time": (UnitOfTime.MICROSECONDS, SensorStateClass.MEASUREMENT, True),
+    "registers_changed": (None, SensorStateClass.TOTAL_INCREASING, False),
+    "registers_unchanged": (None, SensorStateClass.TOTAL_INCREASING, False),
+    "registers_throttled": (None, SensorStateClass.TOTAL_INCREASING, False),
+    "publishes_sent": (None, SensorStateClass.TOTAL_INCREASING, False),
+    "publish_latency": (UnitOfTime.MILLISECONDS, SensorStateClass.MEASUREMENT, False),
+    "last_message_age": (UnitOfTime.SECONDS, SensorStateClass.MEASUREMENT, False),
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -69,45 +78,52 @@ async def async_setup_entry(
     during initialization of a new integration.
     """
     heatpump = hass.data[DOMAIN]._heatpumps[config_entry.data[CONF_ID]]
-    entities = []
-
-    for reg_name, reg_data in remko_reg.items():
-        reg_type = reg_data[FIELD_REGTYPE]
-        reg_id = reg_data[FIELD_REGID]
-        active = (
-            reg_data[FIELD_ACTIVE] != False
-        )  # Default to True if FIELD_ACTIVE not present
-
-        # Only create sensors for supported types that are available
-        if reg_type not in _SENSOR_TYPES or reg_id not in heatpump._capabilities:
-            continue
-
-        # Get friendly name from translation (list indexed by language)
-        friendly_name = None
-        if reg_name in remko_reg_translation:
-            try:
-                friendly_name = remko_reg_translation[reg_name][heatpump._langid]
-            except (IndexError, KeyError):
+
+    @callback
+    def _async_add_registers(specs) -> None:
+        """Create entities for registers confirmed on the heat pump."""
+        entities = []
+        for spec in specs:
+            if spec.platform != "sensor":
+                continue
+
+            friendly_name = spec.friendly_name(heatpump._langid)
+            if friendly_name is None:
                 _LOGGER.warning(
                     "Could not get translation for %s at language index %s",
-                    reg_name,
+                    spec.name,
                     heatpump._langid,
                 )
 
-        entities.append(
-            HeatPumpSensor(
-                hass=hass,
-                heatpump=heatpump,
-                reg_name=reg_name,
-                reg_id=reg_id,
-                active=active,
-                reg_type=reg_type,
-                reg_unit=reg_data[FIELD_UNIT],
-                friendly_name=friendly_name,
+            entities.append(
+                HeatPumpSensor(
+                    hass=hass,
+                    heatpump=heatpump,
+                    reg_name=spec.name,
+                    reg_id=spec.key,
+                    active=spec.active,
+                    reg_type=spec.reg_type,
+                    reg_unit=spec.unit,
+                    friendly_name=friendly_name,
+                )
             )
-        )
 
-    async_add_entities(entities)
+        if entities:
+            async_add_entities(entities)
+
+    async_add_entities(
+        HeatPumpDiagnosticSensor(heatpump, key) for key in _DIAGNOSTIC_SENSORS
+    )
+
+    # Registers confirmed so far, the others are added once discovered
+    _async_add_registers(
+        [spec for spec in BY_PLATFORM["sensor"] if spec.key in heatpump._capabilities]
+    )
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, heatpump.new_registers_signal, _async_add_registers
+        )
+    )
 
 
 class HeatPumpSensor(SensorEntity):
@@ -115,6 +131,7 @@ class HeatPumpSensor(SensorEntity):
 
     _attr_has_entity_name = True
     _attr_available = True
+    _attr_should_poll = False
 
     def __init__(
         self,
@@ -150,6 +167,7 @@ class HeatPumpSensor(SensorEntity):
         # State
         self._state = None
         self._previous_timeprogram = None
+        self._timeprogram_mask: bytes | None = None
 
         # Active flag
         self._active = active
@@ -180,8 +198,9 @@ class HeatPumpSensor(SensorEntity):
         if self._reg_type != "timeprogram":
             return {}
 
-        timeprogram = self._heatpump._hpstate.get(self._reg_id)
-        if isinstance(timeprogram, dict) and "mon" in timeprogram:
+        # Shared with the converter cache, Home Assistant only reads it
+        timeprogram = self._heatpump.get_timeprogram(self._reg_id)
+        if timeprogram is not None:
             return {"timeprogram": timeprogram}
         return {}
 
@@ -217,17 +236,23 @@ class HeatPumpSensor(SensorEntity):
     async def async_added_to_hass(self) -> None:
         """Register event listeners when entity is added to Home Assistant."""
 
-        # MQTT data update listener
-        @callback
-        def _handle_mqtt_event(event) -> None:
-            """Handle MQTT message received event."""
-            self.hass.async_create_task(self._async_update_from_event(event))
+        # Register change listener
+        self.async_on_remove(
+            self._heatpump.async_add_listener(self._reg_id, self._handle_update)
+        )
 
-        mqtt_event = f"{self._heatpump._domain}_{self._heatpump._id}_msg_rec_event"
-        mqtt_listener = self.hass.bus.async_listen(mqtt_event, _handle_mqtt_event)
-        self.async_on_remove(mqtt_listener)
+        # Full refresh listener
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, self._heatpump.refresh_signal, self._handle_update
+            )
+        )
         _LOGGER.debug("MQTT event listener registered for %s", self.entity_id)
 
+        # Start from the last known value, e.g. restored from the previous run
+        if self._heatpump.has_value(self._reg_id):
+            self._handle_update()
+
         # Disable entity if active=False
         if not self._active:
             await self._disable_entity(self.hass, self.entity_id, True)
@@ -250,9 +275,10 @@ class HeatPumpSensor(SensorEntity):
                 "Timeprogram event listener registered for %s", self.entity_id
             )
 
-    async def _async_update_from_event(self, event) -> None:
-        """Update state from MQTT event."""
-        _LOGGER.debug("MQTT event received for %s", self._reg_name)
+    @callback
+    def _handle_update(self) -> None:
+        """Update state from heat pump data."""
+        _LOGGER.debug("MQTT update received for %s", self._reg_name)
 
         value = self._heatpump.get_value(self._reg_id)
 
@@ -262,13 +288,19 @@ class HeatPumpSensor(SensorEntity):
 
         # For timeprogram, set state to "loaded" instead of the dict
         if self._reg_type == "timeprogram":
-            if isinstance(value, dict):
-                new_state = "loaded"
-            else:
+            if not isinstance(value, bytes):
                 return
-        else:
-            new_state = value
+            if value != self._timeprogram_mask:
+                # State stays "loaded", only the attributes change
+                self._timeprogram_mask = value
+                self._state = "loaded"
+                self.async_write_ha_state()
+            return
 
+        new_state = value
+        if self._reg_type == "sensor_mode":
+            # Raw code is translated to the configured language
+            new_state = self._heatpump.get_label(self._reg_id) or value
         if self._state != new_state:
             self._state = new_state
             self.async_write_ha_state()
@@ -308,32 +340,47 @@ class HeatPumpSensor(SensorEntity):
             )
             return
 
-        # Send to heat pump
-        await self._heatpump.send_mqtt_reg(self._reg_name, timeprogram_hex)
-
-        # Update local cache
-        self._heatpump._hpstate[self._reg_id] = timeprogram
-
-        # Notify Home Assistant
-        self.async_write_ha_state()
+        # Shown right away, rolled back if the device does not confirm it
+        await self._heatpump.async_write_register(self._reg_name, timeprogram_hex)
         _LOGGER.debug("Timeprogram sent and state updated for %s", self.entity_id)
 
-    async def async_update(self) -> None:
-        """Fetch latest value from heat pump and update state."""
-        _LOGGER.debug("Updating sensor state for %s", self._reg_name)
 
-        value = self._heatpump.get_value(self._reg_id)
+class HeatPumpDiagnosticSensor(SensorEntity):
+    """Performance metric of the MQTT interface, disabled by default."""
 
-        if value is None:
-            _LOGGER.warning("Could not retrieve value for %s", self._reg_name)
-            self._attr_available = False
-            return
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_icon = "mdi:chart-line"
 
-        self._attr_available = True
+    def __init__(self, heatpump: Any, key: str) -> None:
+        """Initialize diagnostic sensor."""
+        self._heatpump = heatpump
+        self._key = key
+        unit, state_class, profiling = _DIAGNOSTIC_SENSORS[key]
+        self._profiling = profiling
+
+        self._attr_unique_id = f"{heatpump._id}_diagnostic_{key}"
+        self._attr_name = remko_reg_translation[f"diagnostic_{key}"][heatpump._langid]
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, heatpump._id)},
+            name=CONF_NAME,
+            manufacturer="Remko",
+            model=CONF_VER,
+            entry_type=DeviceEntryType.SERVICE,
+        )
 
-        # For timeprogram, set state to "loaded" instead of the dict
-        if self._reg_type == "timeprogram":
-            if isinstance(value, dict):
-                self._state = "loaded"
-        else:
-            self._state = value
+    async def async_added_to_hass(self) -> None:
+        """Start taking timings if this sensor shows them."""
+        if self._profiling:
+            self.async_on_remove(self._heatpump.async_enable_profiling())
+        await self.async_update()
+
+    async def async_update(self) -> None:
+        """Read the metric, polled as the values change continuously."""
+        metrics = self._heatpump.metrics
+        self._attr_native_value = metrics[self._key]
+        if self._key == "decode_time":
+            self._attr_extra_state_attributes = metrics["decode_time_by_type"]
@@ -0,0 +1,143 @@
+"""Per-register update policies: minimum interval, deadband and heartbeat."""
+
+import math
+from typing import Any
+
+from .registry import BY_NAME
+
+# Register types whose values are amounts, so a relative deadband makes
+# sense.  Temperatures change sign and only take an absolute deadband.
+_RELATIVE_TYPES = {"sensor_el", "sensor_en", "sensor_counter"}
+
+
+class RegisterPolicy:
+    """Update policy for a single register."""
+
+    __slots__ = ("min_interval", "deadband", "relative", "heartbeat")
+
+    def __init__(
+        self,
+        min_interval: float = 0.0,
+        deadband: float = 0.0,
+        relative: bool = False,
+        heartbeat: float = 0.0,
+    ) -> None:
+        """Initialize policy.
+
+        min_interval: minimum seconds between two accepted values
+        deadband: ignore changes smaller than this (percent if relative)
+        heartbeat: accept any value once the last one is older than this
+        """
+        self.min_interval = min_interval
+        self.deadband = deadband
+        self.relative = relative
+        self.heartbeat = heartbeat
+
+    def __repr__(self) -> str:
+        deadband = f"{self.deadband}%" if self.relative else f"{self.deadband}"
+        return (
+            f"RegisterPolicy({self.min_interval}s, deadband {deadband}, "
+            f"heartbeat {self.heartbeat}s)"
+        )
+
+    @property
+    def unlimited(self) -> bool:
+        """Return True if the policy lets every value pass."""
+        return not (self.min_interval or self.deadband or self.heartbeat)
+
+    def in_deadband(self, old: Any, new: Any) -> bool:
+        """Return True if the change from old to new is below the deadband."""
+        if not self.deadband:
+            return False
+        try:
+            # Round away float noise, e.g. 20.2 - 20.0 < 0.2
+            delta = round(abs(new - old), 6)
+            if self.relative:
+                return delta * 100 < self.deadband * abs(old)
+            return delta < self.deadband
+        except TypeError:
+            # Not numeric (yet), e.g. still "unknown"
+            return False
+
+
+class ThrottleEngine:
+    """Decide whether a decoded register value is applied to the state."""
+
+    def __init__(self) -> None:
+        """Initialize engine without any policies."""
+        self._policies: dict[str, RegisterPolicy] = {}
+        self._last: dict[str, tuple[float, Any]] = {}
+
+    def set_policy(self, reg_id: str, policy: RegisterPolicy) -> None:
+        """Set policy for a register."""
+        self._policies[reg_id] = policy
+
+    def clear(self) -> None:
+        """Remove all policies and accepted values."""
+        self._policies.clear()
+        self._last.clear()
+
+    def accept(self, reg_id: str, value: Any, now: float) -> bool:
+        """Return True if the value passes the register policy.
+
+        now must come from a monotonic clock.
+        """
+        policy = self._policies.get(reg_id)
+        last = self._last.get(reg_id)
+        if policy is not None and last is not None:
+            last_time, last_value = last
+            age = now - last_time
+            if not (policy.heartbeat and age >= policy.heartbeat):
+                if age < policy.min_interval:
+                    return False
+                if policy.in_deadband(last_value, value):
+                    return False
+
+        self._last[reg_id] = (now, value)
+        return True
+
+
+def parse_policies(text: str) -> dict[str, RegisterPolicy]:
+    """Parse per-register policy overrides.
+
+    Format: "reg_name=min_interval/deadband/heartbeat" entries separated by
+    commas or new lines, e.g. "out_temp=60/0.2/600, el_consumption=10/5%".
+    Trailing fields may be omitted, a deadband ending in "%" is relative
+    and only allowed for power, energy and counter registers.  Raises
+    ValueError on invalid input.
+    """
+    policies = {}
+    for item in text.replace("\n", ",").split(","):
+        item = item.strip()
+        if not item:
+            continue
+
+        reg_name, sep, settings = item.partition("=")
+        reg_name = reg_name.strip()
+        parts = [part.strip() for part in settings.split("/")]
+        if not sep or not reg_name or not any(parts) or len(parts) > 3:
+            raise ValueError(f"Invalid policy: {item}")
+        parts += [""] * (3 - len(parts))
+
+        deadband = parts[1]
+        relative = deadband.endswith("%")
+        if relative:
+            deadband = deadband[:-1].strip()
+            spec = BY_NAME.get(reg_name)
+            if not deadband or (spec and spec.reg_type not in _RELATIVE_TYPES):
+                raise ValueError(f"Invalid relative deadband in policy: {item}")
+
+        values = [
+            float(part) if part else 0.0 for part in (parts[0], deadband, parts[2])
+        ]
+        if any(not math.isfinite(value) or value < 0 for value in values):
+            raise ValueError(f"Invalid value in policy: {item}")
+
+        policies[reg_name] = RegisterPolicy(
+            min_interval=values[0],
+            deadband=values[1],
+            relative=relative,
+            heartbeat=values[2],
+        )
+
+    return policies
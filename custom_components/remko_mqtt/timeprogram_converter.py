@@ -1,14 +1,24 @@
 import logging
+from functools import lru_cache
 from typing import Dict, List, Optional
 import uuid
 
-
 _LOGGER = logging.getLogger(__name__)
 
 
 # 15-Minutes slots per day
 SLOTS_PER_DAY = 96
 SLOTS_PER_HOUR = 4
+BYTES_PER_DAY = SLOTS_PER_DAY // 8
+MASK_BYTES = BYTES_PER_DAY * 7
+EMPTY_MASK = bytes(MASK_BYTES)
+
+# Bit patterns for reversing the bits of each nibble in a day mask
+_BITS_0101 = int("5" * 24, 16)
+_BITS_0011 = int("3" * 24, 16)
+
+# Number of time program dicts kept in the cache
+TIMEPROGRAM_CACHE_SIZE = 64
 
 
 # Remko-internal order of weekdays
@@ -42,77 +52,86 @@ class RemkoTimeProgramConverter:
                 )
                 return RemkoTimeProgramConverter._create_empty_timeprogram()
 
-            timeprogram = RemkoTimeProgramConverter._create_empty_timeprogram()
-
-            WEEKDAYS_REMKO = ["sat", "fri", "tue", "wed", "thu", "mon", "sun"]
-
-            for day_idx, weekday in enumerate(WEEKDAYS_REMKO):
-                day_hex = hex_string[day_idx * 24 : (day_idx + 1) * 24]
-
-                # Reverse the hex string for this day (read from right to left)
-                day_hex_reversed = day_hex[::-1]
-
-                bit_string = ""
-                for hex_char in day_hex_reversed:
-                    nibble_val = int(hex_char, 16)
-                    bits = format(nibble_val, "04b")
-                    # Also reverse the bits within each nibble
-                    bits_reversed = bits[::-1]
-                    bit_string += bits_reversed
+            raw = bytes.fromhex(hex_string)
+            if len(raw) != MASK_BYTES:
+                raise ValueError("non-hex character in time program")
 
-                timeslots = RemkoTimeProgramConverter._find_timeslots(bit_string)
-
-                timeprogram[weekday]["timeslots"] = timeslots
-
-            return timeprogram
+            return RemkoTimeProgramConverter.mask_to_timeprogram(raw)
 
         except Exception as e:
             _LOGGER.error(f"Error converting hex to time program: {e}")
             return RemkoTimeProgramConverter._create_empty_timeprogram()
 
     @staticmethod
-    def timeprogram_to_hex(timeprogram: dict) -> Optional[str]:
+    def hex_to_mask(hex_string: str) -> bytes:
+        """Return the 84-byte slot mask of a time program hex string.
+
+        Invalid input gives the mask of an empty time program.
+        """
         try:
-            if not timeprogram or not isinstance(timeprogram, dict):
-                return None
+            if not hex_string or len(hex_string) != 168:
+                raise ValueError(
+                    f"Invalid hex length: {len(hex_string) if hex_string else 0}"
+                )
+            raw = bytes.fromhex(hex_string)
+            if len(raw) != MASK_BYTES:
+                raise ValueError("non-hex character in time program")
+            return raw
 
-            hex_string = ""
+        except Exception as e:
+            _LOGGER.error(f"Error converting hex to time program: {e}")
+            return EMPTY_MASK
 
-            for weekday in WEEKDAYS_REMKO:
-                bit_string = ["0"] * 96
+    @staticmethod
+    def mask_to_timeprogram(mask: bytes) -> dict:
+        """Build the time program dict from an 84-byte slot mask."""
+        timeprogram = RemkoTimeProgramConverter._create_empty_timeprogram()
 
-                timeslots = timeprogram.get(weekday, {}).get("timeslots", [])
+        for day_idx, weekday in enumerate(WEEKDAYS_REMKO):
+            # Bit n of the day's 96-bit value is the n-th 15-minute slot
+            day_mask = int.from_bytes(
+                mask[day_idx * BYTES_PER_DAY : (day_idx + 1) * BYTES_PER_DAY], "big"
+            )
+            timeprogram[weekday]["timeslots"] = (
+                RemkoTimeProgramConverter._find_timeslots(day_mask)
+            )
 
-                for ts in timeslots:
-                    if ts.get("on", False):
-                        start_slot = RemkoTimeProgramConverter._time_to_slot(
-                            ts.get("start", "00:00")
-                        )
-                        stop_slot = RemkoTimeProgramConverter._time_to_slot(
-                            ts.get("stop", "00:00")
-                        )
+        return timeprogram
 
-                        if stop_slot == 0:
-                            stop_slot = 96
+    @staticmethod
+    @lru_cache(maxsize=TIMEPROGRAM_CACHE_SIZE)
+    def mask_to_timeprogram_cached(mask: bytes) -> dict:
+        """Return time program dict for a slot mask from a bounded LRU cache.
 
-                        for i in range(start_slot, stop_slot):
-                            if i < 96:
-                                bit_string[i] = "1"
+        The returned dict is shared between callers and must not be modified.
+        """
+        return RemkoTimeProgramConverter.mask_to_timeprogram(mask)
 
-                bit_str = "".join(bit_string)
+    @staticmethod
+    def cache_info() -> dict:
+        """Return hit/miss statistics of the time program cache."""
+        info = RemkoTimeProgramConverter.mask_to_timeprogram_cached.cache_info()
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+        }
 
-                # Reverse the bit string (right to left reading)
-                bit_str_reversed = bit_str[::-1]
+    @staticmethod
+    def timeprogram_to_hex(timeprogram: dict) -> Optional[str]:
+        try:
+            if not timeprogram or not isinstance(timeprogram, dict):
+                return None
 
-                day_hex = ""
-                for hour_idx in range(24):
-                    bits_for_hour = bit_str_reversed[hour_idx * 4 : (hour_idx + 1) * 4]
-                    # Reverse bits within each nibble
-                    bits_for_hour_reversed = bits_for_hour[::-1]
-                    hex_nibble = format(int(bits_for_hour_reversed, 2), "X")
-                    day_hex += hex_nibble
+            hex_string = ""
 
-                hex_string += day_hex
+            for day_mask in RemkoTimeProgramConverter._day_masks(timeprogram):
+                # Writes put the first quarter of an hour into the high bit
+                # of its nibble, while reads take it from the low bit
+                hex_string += (
+                    f"{RemkoTimeProgramConverter._reverse_nibbles(day_mask):024X}"
+                )
 
             if len(hex_string) == 168:
                 _LOGGER.debug(f"Time program to Hex: {hex_string}")
@@ -126,33 +145,97 @@ class RemkoTimeProgramConverter:
             return None
 
     @staticmethod
-    def _find_timeslots(bit_string: str) -> List[Dict]:
-        timeslots = []
-        in_timeslot = False
-        start_slot = 0
+    def timeprogram_to_mask(timeprogram: dict) -> Optional[bytes]:
+        """Return the 84-byte slot mask of a time program dict."""
+        try:
+            if not timeprogram or not isinstance(timeprogram, dict):
+                return None
+
+            return b"".join(
+                day_mask.to_bytes(BYTES_PER_DAY, "big")
+                for day_mask in RemkoTimeProgramConverter._day_masks(timeprogram)
+            )
+
+        except Exception as e:
+            _LOGGER.error(f"Error converting time program to mask: {e}")
+            return None
+
+    @staticmethod
+    def _day_masks(timeprogram: dict) -> List[int]:
+        day_masks = []
+
+        for weekday in WEEKDAYS_REMKO:
+            day_mask = 0
 
-        for i, bit in enumerate(bit_string):
-            if bit == "1" and not in_timeslot:
-                start_slot = i
-                in_timeslot = True
-            elif bit == "0" and in_timeslot:
-                end_slot = i
-                in_timeslot = False
+            timeslots = timeprogram.get(weekday, {}).get("timeslots", [])
 
-                start_time = RemkoTimeProgramConverter._slot_to_time(start_slot)
-                stop_time = RemkoTimeProgramConverter._slot_to_time(end_slot)
+            for ts in timeslots:
+                if ts.get("on", False):
+                    start_slot = RemkoTimeProgramConverter._time_to_slot(
+                        ts.get("start", "00:00")
+                    )
+                    stop_slot = RemkoTimeProgramConverter._time_to_slot(
+                        ts.get("stop", "00:00")
+                    )
 
-                timeslots.append({"start": start_time, "stop": stop_time, "on": True})
+                    if stop_slot == 0:
+                        stop_slot = SLOTS_PER_DAY
 
-        if in_timeslot:
-            end_slot = SLOTS_PER_DAY
-            start_time = RemkoTimeProgramConverter._slot_to_time(start_slot)
-            stop_time = RemkoTimeProgramConverter._slot_to_time(end_slot)
+                    day_mask |= RemkoTimeProgramConverter._slot_mask(
+                        start_slot, stop_slot
+                    )
 
-            timeslots.append({"start": start_time, "stop": stop_time, "on": True})
+            day_masks.append(day_mask)
+
+        return day_masks
+
+    @staticmethod
+    def _find_timeslots(day_mask: int) -> List[Dict]:
+        timeslots = []
+
+        while day_mask:
+            # Lowest set bit starts a run, the lowest clear bit above it ends it
+            start_slot = (day_mask & -day_mask).bit_length() - 1
+            run = day_mask >> start_slot
+            end_slot = start_slot + (~run & (run + 1)).bit_length() - 1
+            day_mask &= -1 << end_slot
+
+            timeslots.append(
+                {
+                    "start": SLOT_TIMES[start_slot],
+                    "stop": SLOT_TIMES[end_slot],
+                    "on": True,
+                }
+            )
 
         return timeslots
 
+    @staticmethod
+    def _reverse_nibbles(day_mask: int) -> int:
+        """Reverse the bit order within every nibble of a day mask."""
+        day_mask = ((day_mask & _BITS_0101) << 1) | ((day_mask >> 1) & _BITS_0101)
+        return ((day_mask & _BITS_0011) << 2) | ((day_mask >> 2) & _BITS_0011)
+
+    @staticmethod
+    def _slot_mask(start_slot: int, stop_slot: int) -> int:
+        """Return bit mask for the slots start_slot up to stop_slot."""
+        stop_slot = min(stop_slot, SLOTS_PER_DAY)
+        if start_slot >= stop_slot:
+            return 0
+
+        mask = 0
+        if start_slot < 0:
+            # Negative slots count from the end of the day, like list indices
+            if start_slot < -SLOTS_PER_DAY:
+                raise IndexError(f"Invalid slot: {start_slot}")
+            end = min(stop_slot, 0) + SLOTS_PER_DAY
+            mask = (1 << end) - (1 << (start_slot + SLOTS_PER_DAY))
+            start_slot = 0
+
+        if start_slot < stop_slot:
+            mask |= (1 << stop_slot) - (1 << start_slot)
+        return mask
+
     @staticmethod
     def _slot_to_time(slot: int) -> str:
         hours = slot // 4
@@ -165,6 +248,8 @@ class RemkoTimeProgramConverter:
 
     @staticmethod
     def _time_to_slot(time_str: str) -> int:
+        if isinstance(time_str, str) and time_str in SLOT_BY_TIME:
+            return SLOT_BY_TIME[time_str]
         try:
             parts = time_str.split(":")
             hours = int(parts[0])
@@ -186,3 +271,10 @@ class RemkoTimeProgramConverter:
             "sat": {"timeslots": []},
             "sun": {"timeslots": []},
         }
+
+
+# "HH:MM" for every slot boundary, slot 96 wraps to "00:00"
+SLOT_TIMES = tuple(
+    RemkoTimeProgramConverter._slot_to_time(slot) for slot in range(SLOTS_PER_DAY + 1)
+)
+SLOT_BY_TIME = {time: slot for slot, time in enumerate(SLOT_TIMES[:SLOTS_PER_DAY])}
@@ -0,0 +1,193 @@
+"""Benchmark register decoding per HOST2CLIENT message.
+
+Compares the decoder table of HeatPump with the former if/elif chain over
+register types on realistic 38-register payloads: the table lookup on
+its own, HeatPump._update_hpstate and the whole value handling of a
+message.  Throttling is off, so every value is applied.  Run from the
+repository root with the test requirements installed:
+
+    python scripts/benchmark_decoder.py
+"""
+
+import logging
+import random
+import sys
+import time
+import timeit
+from pathlib import Path
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.remko_mqtt.heatpump import HeatPump  # noqa: E402
+from custom_components.remko_mqtt.registry import REGISTERS  # noqa: E402
+from custom_components.remko_mqtt.remko_regs import (  # noqa: E402
+    remko_reg_translation,
+)
+from tests.legacy_timeprogram_converter import (  # noqa: E402
+    RemkoTimeProgramConverter as LegacyConverter,
+)
+
+MESSAGES = 200
+_LOGGER = logging.getLogger(__name__)
+# Codes reported by the select registers
+_SELECT_CODE = {"main_mode": 1, "dhw_opmode": 0, "timemode": 1, "user_profile": 2}
+
+
+class LegacyDecoder:
+    """The if/elif chain of HeatPump._update_hpstate before the table."""
+
+    def __init__(self, freq: int) -> None:
+        self._freq = freq
+        self._langid = 0
+        self._hpstate = {}
+        self._reg_time = {}
+        self._reg_name = {spec.key: spec.name for spec in REGISTERS}
+        self._reg_type = {spec.name: spec.reg_type for spec in REGISTERS}
+
+    def apply(self, values: dict[str, str]) -> None:
+        for reg_id, value in values.items():
+            if reg_id in self._reg_name:
+                self.update_hpstate(reg_id, value)
+
+    def update_hpstate(self, reg_id: str, value: str) -> None:
+        _LOGGER.debug("[%s] Register %s:  %s", "benchmark", reg_id, value)
+        reg_name = self._reg_name[reg_id]
+        reg_type = self._reg_type[reg_name]
+
+        if reg_type == "switch":
+            self._hpstate[reg_id] = int(value, 16) > 0
+        elif reg_type == "timeprogram":
+            self._hpstate[reg_id] = LegacyConverter.hex_to_timeprogram(value)
+        elif reg_type == "sensor_el":
+            if self._due(reg_id):
+                self._hpstate[reg_id] = int(value, 16) * 100
+        elif reg_type in ("sensor_en", "sensor_counter"):
+            if self._due(reg_id):
+                self._hpstate[reg_id] = int(value, 16)
+        elif reg_type == "sensor_temp":
+            if self._due(reg_id):
+                raw = int(value, 16)
+                self._hpstate[reg_id] = (-(raw & 0x8000) | (raw & 0x7FFF)) / 10
+        elif reg_type == "sensor_temp_inp":
+            raw = int(value, 16)
+            self._hpstate[reg_id] = (-(raw & 0x8000) | (raw & 0x7FFF)) / 10
+        elif reg_type == "sensor_mode":
+            mode = f"opmode{int(value, 16)}"
+            self._hpstate[reg_id] = remko_reg_translation[mode][self._langid]
+        elif reg_type == "select_input":
+            self._hpstate[reg_id] = self._get_select_mode(reg_name, value)
+
+    def _get_select_mode(self, reg_id: str, value: str) -> str:
+        int_value = int(value, 16)
+        mode_map = {
+            "main_mode": f"mode{int_value}",
+            "dhw_opmode": f"dhwopmode{int_value}",
+            "timemode": f"timemode{int_value}",
+            "user_profile": f"user_profile{int_value}",
+        }
+        mode = mode_map.get(reg_id, f"mode{int_value}")
+        return remko_reg_translation[mode][self._langid]
+
+    def _due(self, reg_id: str) -> bool:
+        if (
+            reg_id not in self._reg_time
+            or time.time() - self._reg_time[reg_id] > self._freq
+        ):
+            self._reg_time[reg_id] = time.time()
+            return True
+        return False
+
+
+def payloads(rnd: random.Random) -> list[dict[str, str]]:
+    """Return messages with all registers and one unknown, sensors varying."""
+    programs = {
+        spec.key: "".join(rnd.choice("0F3C") for _ in range(168))
+        for spec in REGISTERS
+        if spec.reg_type == "timeprogram"
+    }
+    messages = []
+    for _ in range(MESSAGES):
+        values = {}
+        for spec in REGISTERS:
+            if spec.reg_type == "timeprogram":
+                value = programs[spec.key]
+            elif spec.reg_type == "select_input":
+                value = f"{_SELECT_CODE[spec.name]:02d}"
+            elif spec.reg_type == "sensor_mode":
+                value = f"{rnd.randint(1, 16):04X}"
+            elif spec.reg_type in ("switch", "binary_sensor"):
+                value = f"{rnd.randint(0, 1):04X}"
+            else:
+                value = f"{rnd.randint(0, 400):04X}"
+            values[spec.key] = value
+        values["9999"] = "0000"
+        messages.append(values)
+    return messages
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    rnd = random.Random(1)
+    messages = payloads(rnd)
+    timeprogram_ids = {s.key for s in REGISTERS if s.reg_type == "timeprogram"}
+    scenarios = {
+        f"{len(messages[0])} registers incl. time programs": messages,
+        f"{len(messages[0]) - len(timeprogram_ids)} registers, no time programs": [
+            {k: v for k, v in values.items() if k not in timeprogram_ids}
+            for values in messages
+        ],
+    }
+
+    entry = MagicMock()
+    entry.data = {
+        "id_name": "benchmark",
+        "mqtt_node": "V04P28",
+        "language": "en",
+        "freq": 0,
+    }
+
+    for label, scenario in scenarios.items():
+        legacy = LegacyDecoder(freq=0)
+        heatpump = HeatPump(MagicMock(), entry)
+        heatpump._store = MagicMock()
+
+        def run_legacy() -> None:
+            for values in scenario:
+                legacy.apply(values)
+
+        def run_lookup() -> None:
+            # Table lookup and decoding only
+            decoders = heatpump._decoders
+            state = {}
+            for values in scenario:
+                for reg_id, value in values.items():
+                    entry = decoders.get(reg_id)
+                    if entry is not None:
+                        state[reg_id] = entry[0](value)
+
+        def run_update() -> None:
+            decoders = heatpump._decoders
+            update_hpstate = heatpump._update_hpstate
+            for values in scenario:
+                for reg_id, value in values.items():
+                    if reg_id in decoders:
+                        update_hpstate(reg_id, value)
+
+        def run_message() -> None:
+            # Including unchanged value detection, counters and listeners
+            for values in scenario:
+                heatpump._apply_values(values, None)
+
+        for name, func in (
+            ("if/elif chain", run_legacy),
+            ("table lookup", run_lookup),
+            ("_update_hpstate", run_update),
+            ("_apply_values", run_message),
+        ):
+            seconds = min(timeit.repeat(func, number=5, repeat=20)) / 5
+            print(f"{label:36s} {name:15s} {seconds / len(scenario) * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark fleet mode message routing as the number of heat pumps grows.
+
+Routes messages of the shared subscription through RemkoWorker to 1, 10,
+100 and 1000 nodes with a no-op handler, so only the routing is timed.
+Every tenth message belongs to a node without a heat pump.  Run from the
+repository root with the test requirements installed:
+
+    python scripts/benchmark_dispatch.py
+"""
+
+import asyncio
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.remko_mqtt import RemkoWorker  # noqa: E402
+
+MESSAGES = 100000
+REPEAT = 5
+ROUTES = (1, 10, 100, 1000)
+
+
+class Message:
+    """Minimal MQTT message."""
+
+    def __init__(self, topic: str) -> None:
+        self.topic = topic
+        self.payload = '{"values": {"5032": "00C8"}}'
+
+
+async def handler(message: Message) -> None:
+    """Heat pump message handler doing nothing."""
+
+
+async def run(routes: int, rnd: random.Random) -> None:
+    nodes = [f"V04P{i:04d}" for i in range(routes)]
+    messages = [
+        Message(
+            f"OTHER{i}/SMTID/HOST2CLIENT"
+            if i % 10 == 0
+            else f"{rnd.choice(nodes)}/SMTID/HOST2CLIENT"
+        )
+        for i in range(MESSAGES)
+    ]
+
+    # Best of several runs, each with a new worker
+    lookup = dispatch = direct = float("inf")
+    for _ in range(REPEAT):
+        worker = RemkoWorker(MagicMock())
+        for node in nodes:
+            worker._routes[node] = handler
+
+        start = time.perf_counter()
+        for message in messages:
+            await worker._async_dispatch(message)
+        dispatch = min(dispatch, (time.perf_counter() - start) / MESSAGES * 1e6)
+        lookup = min(lookup, worker.stats["dispatch_avg_us"])
+
+        start = time.perf_counter()
+        for message in messages:
+            await handler(message)
+        direct = min(direct, (time.perf_counter() - start) / MESSAGES * 1e6)
+
+    print(
+        f"{routes:6d} routes  lookup {lookup:5.2f} us  "
+        f"_async_dispatch {dispatch:5.2f} us  direct call {direct:5.2f} us"
+    )
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    rnd = random.Random(22)
+    for routes in ROUTES:
+        asyncio.run(run(routes, rnd))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark the time program converter against the string based reference.
+
+Run from the repository root with the test requirements installed:
+
+    python scripts/benchmark_timeprogram.py
+"""
+
+import logging
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.remko_mqtt.timeprogram_converter import (  # noqa: E402
+    RemkoTimeProgramConverter,
+)
+from tests.legacy_timeprogram_converter import (  # noqa: E402
+    RemkoTimeProgramConverter as LegacyConverter,
+)
+
+ROUNDS = 200
+
+
+def realistic_hex(rnd: random.Random) -> str:
+    """Return a time program with one to three whole hour runs per day."""
+    days = []
+    for _ in range(7):
+        mask = 0
+        for _ in range(rnd.randint(1, 3)):
+            start = rnd.randint(0, 23) * 4
+            stop = min(96, start + rnd.randint(1, 8) * 4)
+            mask |= (1 << stop) - (1 << start)
+        days.append(f"{mask:024X}")
+    return "".join(days)
+
+
+def best_time(func) -> float:
+    """Return best microseconds per call of func."""
+    return min(timeit.repeat(func, number=ROUNDS, repeat=5)) / ROUNDS * 1e6
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    rnd = random.Random(8)
+    hex_strings = [realistic_hex(rnd) for _ in range(10)]
+
+    for name, converter in (
+        ("legacy", LegacyConverter),
+        ("current", RemkoTimeProgramConverter),
+    ):
+        programs = [converter.hex_to_timeprogram(h) for h in hex_strings]
+        decode = best_time(
+            lambda: [converter.hex_to_timeprogram(h) for h in hex_strings]
+        )
+        encode = best_time(lambda: [converter.timeprogram_to_hex(p) for p in programs])
+        print(
+            f"{name:8s} hex_to_timeprogram {decode / len(hex_strings):7.1f} us, "
+            f"timeprogram_to_hex {encode / len(programs):7.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
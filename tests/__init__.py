@@ -0,0 +1 @@
+"""Tests for the Remko-MQTT integration."""
@@ -0,0 +1,135 @@
+"""Tests for the keep-alive scheduler."""
+
+import pytest
+
+from custom_components.remko_mqtt.keepalive import KeepAliveScheduler
+
+
+def _reporting(*times: float) -> KeepAliveScheduler:
+    """Return scheduler that observed reports at the given times."""
+    keepalive = KeepAliveScheduler()
+    for now in times:
+        keepalive.observe(now)
+    return keepalive
+
+
+def test_first_interval_sets_report_interval() -> None:
+    """The first measured interval is taken as is."""
+    keepalive = _reporting(100.0)
+    assert keepalive.report_interval is None
+    keepalive.observe(110.0)
+    assert keepalive.report_interval == 10.0
+    assert keepalive.last_seen == 110.0
+
+
+def test_report_interval_is_moving_average() -> None:
+    """Further intervals move the average by alpha."""
+    keepalive = _reporting(0.0, 10.0, 30.0)
+    assert keepalive.report_interval == pytest.approx(10.0 + 0.2 * (20.0 - 10.0))
+    keepalive.observe(37.0)
+    assert keepalive.report_interval == pytest.approx(12.0 + 0.2 * (7.0 - 12.0))
+
+
+def test_outage_is_not_part_of_report_interval() -> None:
+    """Gaps longer than max_interval leave the average alone."""
+    keepalive = _reporting(0.0, 10.0, 1000.0)
+    assert keepalive.report_interval == 10.0
+    assert keepalive.last_seen == 1000.0
+
+
+@pytest.mark.parametrize(
+    ("report_interval", "silence_limit"),
+    [
+        (None, 30.0),
+        (1.0, 5.0),
+        (10.0, 30.0),
+        (60.0, 180.0),
+        (100.0, 300.0),
+        (250.0, 300.0),
+    ],
+)
+def test_silence_limit_is_clamped(
+    report_interval: float | None, silence_limit: float
+) -> None:
+    """Silence limit is grace report intervals within 5 and 300 s."""
+    keepalive = KeepAliveScheduler()
+    keepalive.report_interval = report_interval
+    assert keepalive.silence_limit == silence_limit
+
+
+def test_first_query_is_due_immediately() -> None:
+    """Without any query the next one is due at once."""
+    assert KeepAliveScheduler().next_query() == float("-inf")
+
+
+def test_refresh_interval_backs_off_while_healthy() -> None:
+    """The refresh interval doubles while reports arrive, up to the maximum."""
+    keepalive = _reporting(0.0, 10.0)
+    keepalive.query_sent(10.0)
+    assert keepalive.refresh_interval == 30.0
+
+    now = 10.0
+    for expected in (60.0, 120.0, 240.0, 300.0, 300.0):
+        keepalive.observe(now + 5.0)
+        now += keepalive.refresh_interval
+        keepalive.observe(now - 1.0)
+        keepalive.query_sent(now)
+        assert keepalive.refresh_interval == expected
+
+
+def test_refresh_interval_backs_off_without_answer() -> None:
+    """Unanswered queries double the refresh interval too."""
+    keepalive = _reporting(0.0, 10.0)
+    keepalive.query_sent(10.0)
+    keepalive.query_sent(40.0)
+    assert keepalive.refresh_interval == 60.0
+    keepalive.query_sent(100.0)
+    assert keepalive.refresh_interval == 120.0
+
+
+def test_refresh_interval_resets_when_overdue_device_answers() -> None:
+    """A device answering after being overdue gets the minimum interval."""
+    keepalive = _reporting(0.0, 10.0)
+    keepalive.query_sent(10.0)
+    keepalive.query_sent(40.0)
+    keepalive.query_sent(100.0)
+    assert keepalive.refresh_interval == 120.0
+
+    # Answer to the last query, then silent beyond the silence limit
+    keepalive.observe(101.0)
+    assert 300.0 - 101.0 >= keepalive.silence_limit
+    keepalive.query_sent(300.0)
+    assert keepalive.refresh_interval == 30.0
+
+
+def test_next_query_waits_for_refresh_after_query() -> None:
+    """Without a report since the last query the refresh interval applies."""
+    keepalive = _reporting(0.0, 10.0)
+    keepalive.query_sent(10.0)
+    assert keepalive.next_query() == 40.0
+
+
+def test_next_query_moves_earlier_with_report() -> None:
+    """A report makes the overdue deadline due before the armed refresh."""
+    keepalive = _reporting(0.0, 10.0)
+    keepalive.query_sent(10.0)
+    keepalive.refresh_interval = 300.0
+    armed = keepalive.next_query()
+    assert armed == 310.0
+
+    keepalive.observe(20.0)
+    assert keepalive.silence_limit == 30.0
+    assert keepalive.next_query() == 50.0 < armed
+
+    # Each further report moves the deadline along
+    keepalive.observe(30.0)
+    assert keepalive.next_query() == pytest.approx(30.0 + keepalive.silence_limit)
+
+
+def test_defer_postpones_next_query() -> None:
+    """Deferring counts as a query without changing the refresh interval."""
+    keepalive = _reporting(0.0, 10.0)
+    keepalive.query_sent(10.0)
+    keepalive.defer(25.0)
+    assert keepalive.refresh_interval == 30.0
+    assert keepalive.next_query() == 55.0
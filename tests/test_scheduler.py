@@ -0,0 +1,250 @@
+"""Tests for the deadline scheduler and the query gate."""
+
+import pytest
+
+from custom_components.remko_mqtt import scheduler
+from custom_components.remko_mqtt.scheduler import DeadlineScheduler, QueryGate
+
+
+class FakeClock:
+    """Monotonic clock and loop timers advanced by hand."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        # [due time, callback], callback is None once cancelled
+        self.timers: list[list] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def call_later(self, hass, delay: float, action):
+        timer = [self.now + delay, action]
+        self.timers.append(timer)
+
+        def cancel() -> None:
+            timer[1] = None
+
+        return cancel
+
+    @property
+    def armed(self) -> list[float]:
+        """Return due times of the timers not cancelled."""
+        return [due for due, action in self.timers if action is not None]
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock on and fire the timers that came due."""
+        self.now += seconds
+        while True:
+            due = [timer for timer in self.timers if timer[1] and timer[0] <= self.now]
+            if not due:
+                return
+            for timer in due:
+                action, timer[1] = timer[1], None
+                action(None)
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Replace the loop timers and the monotonic clock of the scheduler."""
+    clock = FakeClock()
+    monkeypatch.setattr(scheduler, "async_call_later", clock.call_later)
+    monkeypatch.setattr(scheduler.time, "monotonic", clock.monotonic)
+    return clock
+
+
+def test_deadlines_run_in_order(clock: FakeClock) -> None:
+    """Actions run at their deadline, in deadline and submission order."""
+    timers = DeadlineScheduler(None)
+    calls = []
+    timers.call_later(20, lambda: calls.append("c"))
+    timers.call_later(10, lambda: calls.append("a"))
+    timers.call_later(10, lambda: calls.append("b"))
+
+    clock.advance(9)
+    assert calls == []
+    clock.advance(1)
+    assert calls == ["a", "b"]
+    clock.advance(10)
+    assert calls == ["a", "b", "c"]
+    assert timers.stats["pending"] == 0
+
+
+def test_single_timer_for_earliest_deadline(clock: FakeClock) -> None:
+    """Only one loop timer is armed, for the earliest deadline."""
+    timers = DeadlineScheduler(None)
+    timers.call_later(30, lambda: None)
+    assert clock.armed == [1030.0]
+    timers.call_later(40, lambda: None)
+    assert clock.armed == [1030.0]
+
+
+def test_earlier_deadline_rearms_timer(clock: FakeClock) -> None:
+    """An earlier deadline re-arms the timer for it."""
+    timers = DeadlineScheduler(None)
+    calls = []
+    timers.call_later(30, lambda: calls.append("late"))
+    timers.call_later(5, lambda: calls.append("early"))
+    assert clock.armed == [1005.0]
+
+    clock.advance(5)
+    assert calls == ["early"]
+    assert clock.armed == [1030.0]
+
+
+def test_cancel(clock: FakeClock) -> None:
+    """Cancelled actions do not run, cancelling twice is harmless."""
+    timers = DeadlineScheduler(None)
+    calls = []
+    timers.call_later(10, lambda: calls.append("a"))
+    cancel = timers.call_later(20, lambda: calls.append("b"))
+    cancel()
+    cancel()
+    assert timers.stats["pending"] == 1
+    assert timers.stats["cancelled"] == 1
+
+    clock.advance(30)
+    assert calls == ["a"]
+
+
+def test_cancel_head(clock: FakeClock) -> None:
+    """Cancelling the earliest deadline leaves the next one to run."""
+    timers = DeadlineScheduler(None)
+    calls = []
+    cancel = timers.call_later(10, lambda: calls.append("a"))
+    timers.call_later(20, lambda: calls.append("b"))
+    cancel()
+
+    # The timer still fires for the cancelled head, then moves on
+    clock.advance(10)
+    assert calls == []
+    assert clock.armed == [1020.0]
+    clock.advance(10)
+    assert calls == ["b"]
+
+
+def test_cancel_last_disarms_timer(clock: FakeClock) -> None:
+    """Without pending deadlines no timer stays armed."""
+    timers = DeadlineScheduler(None)
+    cancel = timers.call_later(10, lambda: None)
+    cancel()
+    assert clock.armed == []
+    assert timers.stats["pending"] == 0
+
+
+def test_action_scheduling_again(clock: FakeClock) -> None:
+    """Actions may schedule new deadlines while the timer fires."""
+    timers = DeadlineScheduler(None)
+    calls = []
+
+    def tick() -> None:
+        calls.append(clock.now)
+        if len(calls) < 3:
+            timers.call_later(10, tick)
+
+    timers.call_later(10, tick)
+    clock.advance(10)
+    assert clock.armed == [1020.0]
+    clock.advance(10)
+    clock.advance(10)
+    assert calls == [1010.0, 1020.0, 1030.0]
+    assert clock.armed == []
+
+
+def test_stop(clock: FakeClock) -> None:
+    """Stopping drops all deadlines and the timer."""
+    timers = DeadlineScheduler(None)
+    calls = []
+    cancel = timers.call_later(10, lambda: calls.append("a"))
+    timers.call_later(20, lambda: calls.append("b"))
+    timers.async_stop()
+    assert clock.armed == []
+    assert timers.stats["pending"] == 0
+
+    cancel()
+    assert timers.stats["pending"] == 0
+    clock.advance(30)
+    assert calls == []
+
+
+def _gate(max_in_flight: int = 2) -> tuple[QueryGate, list[str]]:
+    gate = QueryGate(DeadlineScheduler(None), max_in_flight=max_in_flight)
+    return gate, []
+
+
+def test_gate_caps_queries_in_flight(clock: FakeClock) -> None:
+    """Queries beyond max_in_flight wait until an answer frees a slot."""
+    gate, sent = _gate()
+    for key in "abc":
+        gate.submit(key, lambda key=key: sent.append(key))
+    assert sent == ["a", "b"]
+    assert gate.stats["waiting"] == 1
+
+    gate.answered("a")
+    assert sent == ["a", "b", "c"]
+    assert gate.stats["in_flight"] == 2
+    assert gate.stats["max_in_flight"] == 2
+
+
+def test_gate_keeps_one_waiting_query_per_key(clock: FakeClock) -> None:
+    """A key with a query in flight waits, repeated submits replace it."""
+    gate, sent = _gate()
+    gate.submit("a", lambda: sent.append("a1"))
+    gate.submit("a", lambda: sent.append("a2"))
+    gate.submit("a", lambda: sent.append("a3"))
+    assert sent == ["a1"]
+    assert gate.stats["queued"] == 1
+
+    gate.answered("a")
+    assert sent == ["a1", "a3"]
+
+
+def test_gate_timeout_releases_slot(clock: FakeClock) -> None:
+    """Unanswered queries free their slot after the timeout."""
+    gate, sent = _gate(max_in_flight=1)
+    gate.submit("a", lambda: sent.append("a"))
+    gate.submit("b", lambda: sent.append("b"))
+
+    clock.advance(gate.timeout - 1)
+    assert sent == ["a"]
+    clock.advance(1)
+    assert sent == ["a", "b"]
+    assert gate.stats["timeouts"] == 1
+
+    # The answer in time cancels the timeout of the next query
+    gate.answered("b")
+    clock.advance(gate.timeout)
+    assert gate.stats["timeouts"] == 1
+    assert gate.stats["in_flight"] == 0
+
+
+def test_gate_remove(clock: FakeClock) -> None:
+    """Removing a key drops its waiting query and frees its slot."""
+    gate, sent = _gate(max_in_flight=1)
+    gate.submit("a", lambda: sent.append("a"))
+    gate.submit("b", lambda: sent.append("b"))
+    gate.submit("c", lambda: sent.append("c"))
+    gate.remove("b")
+    gate.remove("a")
+    assert sent == ["a", "c"]
+
+
+def test_gate_records_burst_spread(clock: FakeClock) -> None:
+    """A burst records when its queries were really sent."""
+    gate, sent = _gate(max_in_flight=1)
+    gate.track_burst("reconnect", ["a", "b"])
+    gate.submit("a", lambda: sent.append("a"))
+    clock.advance(2)
+    gate.submit("b", lambda: sent.append("b"))
+    assert gate.burst["complete"] is False
+
+    clock.advance(3)
+    gate.answered("a")
+    assert gate.burst == {
+        "trigger": "reconnect",
+        "complete": True,
+        "queries": 2,
+        "first_s": 0.0,
+        "last_s": 5.0,
+        "spread_s": 5.0,
+        "peak_in_flight": 1,
+    }
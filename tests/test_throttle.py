@@ -0,0 +1,184 @@
+"""Tests for the register update policies."""
+
+import random
+
+import pytest
+
+from custom_components.remko_mqtt.throttle import (
+    RegisterPolicy,
+    ThrottleEngine,
+    parse_policies,
+)
+
+
+def _fields(policy: RegisterPolicy) -> tuple:
+    return (policy.min_interval, policy.deadband, policy.relative, policy.heartbeat)
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("", {}),
+        (" , \n ", {}),
+        ("out_temp=60", {"out_temp": (60.0, 0.0, False, 0.0)}),
+        ("out_temp=60/0.2", {"out_temp": (60.0, 0.2, False, 0.0)}),
+        ("out_temp=60/0.2/600", {"out_temp": (60.0, 0.2, False, 600.0)}),
+        ("out_temp=/0.5", {"out_temp": (0.0, 0.5, False, 0.0)}),
+        ("out_temp=//600", {"out_temp": (0.0, 0.0, False, 600.0)}),
+        (" out_temp = 60 / 0.2 ", {"out_temp": (60.0, 0.2, False, 0.0)}),
+        ("el_consumption=10/5%", {"el_consumption": (10.0, 5.0, True, 0.0)}),
+        ("energy_heating=0/1 %", {"energy_heating": (0.0, 1.0, True, 0.0)}),
+        (
+            "compressor_starts=/10%/3600",
+            {"compressor_starts": (0.0, 10.0, True, 3600.0)},
+        ),
+        (
+            "out_temp=60/0.2/600, el_consumption=10/5%\nwater_temp=1e2",
+            {
+                "out_temp": (60.0, 0.2, False, 600.0),
+                "el_consumption": (10.0, 5.0, True, 0.0),
+                "water_temp": (100.0, 0.0, False, 0.0),
+            },
+        ),
+        # Later entries win
+        ("out_temp=60, out_temp=30", {"out_temp": (30.0, 0.0, False, 0.0)}),
+        # Names are checked by the config flow
+        ("no_such_register=10/5%", {"no_such_register": (10.0, 5.0, True, 0.0)}),
+    ],
+)
+def test_parse_policies(text: str, expected: dict) -> None:
+    """Valid policy texts."""
+    policies = parse_policies(text)
+    assert {name: _fields(policy) for name, policy in policies.items()} == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        # Missing parts
+        "out_temp",
+        "out_temp=",
+        "out_temp=//",
+        "=60/0.2",
+        "out_temp=60/0.2/600/1",
+        # Bad numbers
+        "out_temp=abc",
+        "out_temp=60/x",
+        "out_temp=60/0.2/1h",
+        "out_temp=-1",
+        "out_temp=60/-0.2",
+        "out_temp=nan",
+        "out_temp=inf",
+        "out_temp=1e400",
+        "out_temp=0x10",
+        # Relative deadband without a number or on an absolute register
+        "el_consumption=10/%",
+        "out_temp=60/5%",
+        "water_temp_req=/10%",
+        "el_consumption=10/5%%",
+        # One bad entry spoils all
+        "out_temp=60, water_temp",
+    ],
+)
+def test_parse_policies_invalid(text: str) -> None:
+    """Invalid policy texts raise ValueError."""
+    with pytest.raises(ValueError):
+        parse_policies(text)
+
+
+def test_parse_policies_raises_only_value_error() -> None:
+    """The config flow only catches ValueError, whatever is entered."""
+    rnd = random.Random(5)
+    alphabet = "out_temp=el_consumption/%,\n .-+e0123456789xnaif"
+    for _ in range(5000):
+        text = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 40)))
+        try:
+            parse_policies(text)
+        except ValueError:
+            pass
+
+
+def test_accept_without_policy() -> None:
+    """Registers without a policy take every value."""
+    engine = ThrottleEngine()
+    assert engine.accept("1", 20.0, 0.0)
+    assert engine.accept("1", 20.0, 0.1)
+
+
+# Policy (interval, deadband, relative, heartbeat), last accepted value at
+# time 0, new value and its time -> accepted
+ACCEPT_CASES = [
+    # Minimum interval
+    ((60, 0, False, 0), 20.0, 25.0, 59.0, False),
+    ((60, 0, False, 0), 20.0, 25.0, 60.0, True),
+    # Absolute deadband, float noise included
+    ((0, 0.2, False, 0), 20.0, 20.1, 1.0, False),
+    ((0, 0.2, False, 0), 20.0, 20.2, 1.0, True),
+    ((0, 0.2, False, 0), 20.0, 19.8, 1.0, True),
+    # Relative deadband in percent of the last value
+    ((0, 5, True, 0), 1000, 1049, 1.0, False),
+    ((0, 5, True, 0), 1000, 1050, 1.0, True),
+    ((0, 5, True, 0), 1000, 951, 1.0, False),
+    ((0, 5, True, 0), 0, 1, 1.0, True),
+    # Interval is checked before the deadband
+    ((60, 0.2, False, 0), 20.0, 30.0, 10.0, False),
+    ((60, 0.2, False, 0), 20.0, 20.1, 70.0, False),
+    # Heartbeat overrides interval and deadband
+    ((60, 0.2, False, 600), 20.0, 20.0, 600.0, True),
+    ((900, 0.2, False, 600), 20.0, 25.0, 600.0, True),
+    ((900, 0.2, False, 600), 20.0, 25.0, 599.0, False),
+    # Values that are not numbers pass the deadband
+    ((0, 0.2, False, 0), "unknown", 20.0, 1.0, True),
+    ((0, 0.2, False, 0), 20.0, None, 1.0, True),
+]
+
+
+@pytest.mark.parametrize(("policy", "last", "value", "now", "accepted"), ACCEPT_CASES)
+def test_accept(policy: tuple, last, value, now: float, accepted: bool) -> None:
+    """Interval, deadband and heartbeat decide in that order."""
+    engine = ThrottleEngine()
+    engine.set_policy("1", RegisterPolicy(*policy))
+    assert engine.accept("1", last, 0.0)
+    assert engine.accept("1", value, now) is accepted
+
+
+def test_rejected_values_keep_last_accepted() -> None:
+    """Deadband and interval count from the last accepted value."""
+    engine = ThrottleEngine()
+    engine.set_policy("1", RegisterPolicy(0, 0.5))
+    assert engine.accept("1", 20.0, 0.0)
+    # Creeping changes add up against the last accepted value
+    assert not engine.accept("1", 20.3, 1.0)
+    assert engine.accept("1", 20.6, 2.0)
+    assert not engine.accept("1", 20.3, 3.0)
+
+    engine.set_policy("2", RegisterPolicy(60))
+    assert engine.accept("2", 1, 0.0)
+    assert not engine.accept("2", 2, 50.0)
+    assert engine.accept("2", 3, 60.0)
+    assert not engine.accept("2", 4, 100.0)
+
+
+def test_clear_forgets_policies_and_values() -> None:
+    """After clear every value passes again."""
+    engine = ThrottleEngine()
+    engine.set_policy("1", RegisterPolicy(60))
+    assert engine.accept("1", 1, 0.0)
+    engine.clear()
+    assert engine.accept("1", 2, 1.0)
+    assert engine.accept("1", 3, 2.0)
+
+
+@pytest.mark.parametrize(
+    ("policy", "unlimited"),
+    [
+        (RegisterPolicy(), True),
+        (RegisterPolicy(0, 0, True, 0), True),
+        (RegisterPolicy(60), False),
+        (RegisterPolicy(0, 0.2), False),
+        (RegisterPolicy(heartbeat=600), False),
+    ],
+)
+def test_unlimited(policy: RegisterPolicy, unlimited: bool) -> None:
+    """Only policies without any limit let every value pass."""
+    assert policy.unlimited is unlimited
@@ -0,0 +1,156 @@
+"""Tests for the time program converter.
+
+Golden vectors pin the device format, the fuzz corpus checks the bit mask
+converter against the string based reference byte for byte.
+"""
+
+import random
+
+import pytest
+
+from custom_components.remko_mqtt.timeprogram_converter import (
+    RemkoTimeProgramConverter as Converter,
+)
+
+from .legacy_timeprogram_converter import RemkoTimeProgramConverter as Reference
+
+EMPTY_DAY = "0" * 24
+HEX_DIGITS = "0123456789ABCDEFabcdef"
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+def _slot(start: str, stop: str) -> dict:
+    return {"start": start, "stop": stop, "on": True}
+
+
+# Hex string (days in device order sat, fri, tue, wed, thu, mon, sun)
+# -> timeslots of the days that have any
+GOLDEN_HEX = [
+    ("0" * 168, {}),
+    ("F" * 168, {day: [_slot("00:00", "00:00")] for day in WEEKDAYS}),
+    ("000000000000FFFF00000000" + EMPTY_DAY * 6, {"sat": [_slot("08:00", "12:00")]}),
+    (
+        EMPTY_DAY * 2 + "00000000000000000000000F" + EMPTY_DAY * 4,
+        {"tue": [_slot("00:00", "01:00")]},
+    ),
+    # Reads take the first quarter of an hour from the low bit of a nibble
+    ("0" * 23 + "1" + EMPTY_DAY * 6, {"sat": [_slot("00:00", "00:15")]}),
+    ("1" + "0" * 23 + EMPTY_DAY * 6, {"sat": [_slot("23:00", "23:15")]}),
+    ("8" + "0" * 23 + EMPTY_DAY * 6, {"sat": [_slot("23:45", "00:00")]}),
+]
+
+# Time program -> hex string
+GOLDEN_PROGRAMS = [
+    # Writes put the first quarter of an hour into the high bit of a nibble
+    (
+        {"mon": {"timeslots": [_slot("00:00", "00:15")]}},
+        EMPTY_DAY * 5 + "000000000000000000000008" + EMPTY_DAY,
+    ),
+    (
+        {"sat": {"timeslots": [_slot("06:00", "08:30"), _slot("22:00", "00:00")]}},
+        "FF0000000000000CFF000000" + EMPTY_DAY * 6,
+    ),
+    ({"sun": {"timeslots": [{**_slot("06:00", "08:00"), "on": False}]}}, "0" * 168),
+]
+
+
+@pytest.mark.parametrize(("hex_string", "timeslots"), GOLDEN_HEX)
+def test_hex_to_timeprogram_golden(hex_string: str, timeslots: dict) -> None:
+    """Decode known device strings."""
+    expected = {day: {"timeslots": timeslots.get(day, [])} for day in WEEKDAYS}
+    assert Converter.hex_to_timeprogram(hex_string) == expected
+    assert Reference.hex_to_timeprogram(hex_string) == expected
+
+
+@pytest.mark.parametrize(("timeprogram", "hex_string"), GOLDEN_PROGRAMS)
+def test_timeprogram_to_hex_golden(timeprogram: dict, hex_string: str) -> None:
+    """Encode known time programs."""
+    assert Converter.timeprogram_to_hex(timeprogram) == hex_string
+    assert Reference.timeprogram_to_hex(timeprogram) == hex_string
+
+
+def test_nibble_order_differs_between_read_and_write() -> None:
+    """A written program does not read back the same, as on the device."""
+    timeprogram = {"sat": {"timeslots": [_slot("06:00", "08:30")]}}
+    read_back = Converter.hex_to_timeprogram(Converter.timeprogram_to_hex(timeprogram))
+    assert read_back["sat"]["timeslots"] == [
+        _slot("06:00", "08:00"),
+        _slot("08:30", "09:00"),
+    ]
+
+
+@pytest.mark.parametrize("hex_string", ["", "0" * 167, "0" * 169, "G" * 168, None])
+def test_invalid_hex_gives_empty_program(hex_string) -> None:
+    """Invalid input decodes to an empty time program."""
+    expected = Reference.hex_to_timeprogram(hex_string)
+    assert Converter.hex_to_timeprogram(hex_string) == expected
+    assert all(not day["timeslots"] for day in expected.values())
+
+
+def _random_hex(rnd: random.Random) -> str:
+    kind = rnd.random()
+    if kind < 0.4:
+        return "".join(rnd.choice(HEX_DIGITS) for _ in range(168))
+    if kind < 0.6:
+        return "".join(rnd.choice("0F") for _ in range(168))
+    if kind < 0.9:
+        # A few runs per day, like real schedules
+        days = []
+        for _ in range(7):
+            mask = 0
+            for _ in range(rnd.randint(0, 4)):
+                start = rnd.randint(0, 95)
+                mask |= (1 << rnd.randint(start, 96)) - (1 << start)
+            days.append(f"{mask:024X}")
+        return "".join(days)
+    # Invalid characters or lengths
+    chars = list("".join(rnd.choice(HEX_DIGITS) for _ in range(168)))
+    chars[rnd.randrange(168)] = rnd.choice(" xg-+_\t")
+    return "".join(chars) if rnd.random() < 0.5 else "".join(chars[:167])
+
+
+def _random_time(rnd: random.Random) -> str:
+    if rnd.random() < 0.2:
+        # Out of range and odd values
+        return f"{rnd.randint(-30, 30):02d}:{rnd.randint(-20, 70):02d}"
+    return f"{rnd.randint(0, 24):02d}:{rnd.choice([0, 15, 30, 45, 7])}"
+
+
+def _random_timeprogram(rnd: random.Random) -> dict:
+    timeprogram = {}
+    for day in WEEKDAYS:
+        if rnd.random() < 0.05:
+            continue
+        timeprogram[day] = {
+            "timeslots": [
+                {
+                    "start": _random_time(rnd),
+                    "stop": _random_time(rnd),
+                    "on": rnd.random() < 0.9,
+                }
+                for _ in range(rnd.randint(0, 4))
+            ]
+        }
+    return timeprogram
+
+
+def test_fuzz_hex_to_timeprogram_matches_reference() -> None:
+    """Decoding matches the reference for a seeded random corpus."""
+    rnd = random.Random(8)
+    for _ in range(5000):
+        hex_string = _random_hex(rnd)
+        assert Converter.hex_to_timeprogram(hex_string) == Reference.hex_to_timeprogram(
+            hex_string
+        ), hex_string
+
+
+def test_fuzz_timeprogram_to_hex_matches_reference() -> None:
+    """Encoding and the round trip match the reference byte for byte."""
+    rnd = random.Random(8)
+    for _ in range(5000):
+        timeprogram = _random_timeprogram(rnd)
+        hex_string = Converter.timeprogram_to_hex(timeprogram)
+        assert hex_string == Reference.timeprogram_to_hex(timeprogram), timeprogram
+        assert Converter.timeprogram_to_hex(
+            Converter.hex_to_timeprogram(hex_string)
+        ) == Reference.timeprogram_to_hex(Reference.hex_to_timeprogram(hex_string))